@@ -0,0 +1,58 @@
+"""
+Thin adapters between web frameworks and :meth:`Interface.handle`. Neither framework is required, only the one you use.
+
+Both set `response_sent` once the framework has written the response, so follow-ups wait for it.
+"""
+from asyncio import Event
+try:
+    from quart import request as quart_request, Response as QuartResponse
+except ImportError:
+    quart_request = QuartResponse = None
+
+try:
+    from starlette.background import BackgroundTask
+    from starlette.responses import Response as StarletteResponse
+except ImportError:
+    BackgroundTask = StarletteResponse = None
+
+
+async def process_quart(interface):
+    """
+    Handles the current Quart request. Use it from a route: `return await process_quart(client)`.
+    """
+    body = await quart_request.get_data()
+    response_sent = Event()
+    status, content = await interface.handle(
+        body,
+        quart_request.headers.get("X-Signature-Ed25519", ""),
+        quart_request.headers.get("X-Signature-Timestamp", ""),
+        dict(quart_request.headers),
+        response_sent = response_sent
+    )
+    content = content or b""
+
+    # Quart has no hook for after a response is sent, but it only asks a streamed body for more once it's written what it has.
+    async def stream():
+        try:
+            yield content
+        finally:
+            response_sent.set()
+
+    return QuartResponse(stream(), status = status, content_type = "application/json", headers = {"Content-Length": str(len(content))})
+
+
+async def process_starlette(interface, request):
+    """
+    Handles a Starlette (or FastAPI) request. Use it from a route: `return await process_starlette(client, request)`.
+    """
+    body = await request.body()
+    response_sent = Event()
+    status, content = await interface.handle(
+        body,
+        request.headers.get("X-Signature-Ed25519", ""),
+        request.headers.get("X-Signature-Timestamp", ""),
+        dict(request.headers),
+        response_sent = response_sent
+    )
+    # Background tasks run once the response has been sent.
+    return StarletteResponse(content, status_code = status, media_type = "application/json" if content else None, background = BackgroundTask(response_sent.set))
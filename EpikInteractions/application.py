@@ -1,25 +1,32 @@
 from typing import Optional, List
-from .mentioned import PartialUser
+from .partials import PartialUser
+from .snowflake import Snowflake, snowflake
 
 class TeamMember:
+    __slots__ = ("data", "membership_state", "team_id", "user")
+
     def __init__(self, data: dict):
         self.data = data
         self.membership_state: int = data.get("membership_state")
-        self.team_id: str = data.get("team_id")
+        self.team_id: Snowflake = snowflake(data.get("team_id"))
         self.user: PartialUser = PartialUser(data.get("user"))
 
 
 class Team:
+    __slots__ = ("data", "icon", "id", "members")
+
     def __init__(self, data: dict):
         self.data = data
         self.icon: str = data.get("icon")
-        self.id: str = data.get("id")
+        self.id: Snowflake = snowflake(data.get("id"))
         self.members: List[TeamMember] = data.get("members")
 
 
 class Application:
+    __slots__ = ("id", "name", "icon", "description", "rpc_origins", "bot_public", "bot_require_code_grant", "terms_of_service_url", "privacy_policy_url", "owner", "summary", "verify_key", "team", "cover_image", "flags")
+
     def __init__(self, data: dict):
-        self.id: str = data.get("id")
+        self.id: Snowflake = snowflake(data.get("id"))
         self.name: str = data.get("name")
         self.icon: Optional[str] = data.get("icon")
         self.description: str = data.get("description")
@@ -1,3 +1,5 @@
+from .snowflake import Snowflake, snowflake
+
 class Attachment:
     """
     Represents an Attachment on Discord
@@ -27,8 +29,10 @@ class Attachment:
         ephemeral
             If the attachment is ephemeral
     """
+    __slots__ = ("id", "filename", "description", "content_type", "size", "url", "proxy_url", "height", "width", "ephemeral")
+
     def __init__(self, data: dict):
-        self.id: str = data.get("id")
+        self.id: Snowflake = snowflake(data.get("id"))
         self.filename: str = data.get("filename")
         self.description: str = data.get("description")
         self.content_type: str = data.get("content_type")
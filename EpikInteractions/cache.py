@@ -0,0 +1,153 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Hashable, Optional, Union
+from .snowflake import Snowflake
+
+
+class LRUCache:
+    """
+    Keeps the `max_size` most recently used objects, dropping the least recently used when it's full. Objects older than `ttl` seconds are treated as missing and dropped when they're next looked up.
+
+    It's bounded by how many objects it holds, not by their size. Large objects (long messages, many embeds) take as much of `max_size` as small ones, so pick `max_size` from how much memory an object of that kind usually takes.
+
+    Attributes:
+    -----------
+    name: str What the cache holds, used in :meth:`EntityCache.stats`.
+    max_size: int The most objects kept at once. 0 disables the cache.
+    ttl: Optional[float] How many seconds an object is kept for. None keeps it until it's evicted.
+    hits: int How many lookups found an object.
+    misses: int How many lookups didn't.
+    evictions: int How many objects were dropped, because the cache was full or they expired.
+    """
+    def __init__(self, name: str, *, max_size: int = 1000, ttl: Optional[float] = None):
+        self.name: str = name
+        self.max_size: int = max_size
+        self.ttl: Optional[float] = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._items: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        item = self._items.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+
+        value, expires_at = item
+        if expires_at is not None and expires_at <= monotonic():
+            del self._items[key]
+            self.evictions += 1
+            self.misses += 1
+            return None
+
+        self._items.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> Any:
+        if self.max_size <= 0:
+            return value
+
+        item = self._items.get(key)
+        if item is not None and item[0] is value:
+            # Adding back what's already cached doesn't make it any fresher, it keeps its expiry.
+            self._items.move_to_end(key)
+            return value
+
+        self._items[key] = (value, monotonic() + self.ttl if self.ttl is not None else None)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last = False)
+            self.evictions += 1
+        return value
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        item = self._items.pop(key, None)
+        return item[0] if item else None
+
+    def clear(self):
+        self._items.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self._items), "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+class EntityCache:
+    """
+    The users, members, channels and messages the Interface has seen, so they don't have to be fetched again.
+
+    It's filled from interaction payloads as they're parsed and from REST responses, and the `fetch_*` methods look in it before making a request. Each kind of object has its own :class:`LRUCache`, so a burst of messages can't push out every member.
+
+    The caches are bounded by count, not by memory. Each cached model also keeps the payload it was parsed from alive, so a user takes about 1 KB, a member about 2 KB and a message about 5 KB, more with embeds and attachments. With the defaults that's around 40 MB when every cache is full, lower the `max_*` arguments if that's too much.
+
+    Attributes:
+    -----------
+    users: LRUCache Users by id.
+    members: LRUCache Members by (guild id, user id).
+    channels: LRUCache Channels and threads by id.
+    messages: LRUCache Messages by id.
+
+    Methods:
+    --------
+    :meth:`stats()` - The size, hits, misses and evictions of each cache.
+    """
+    def __init__(self, *, max_users: int = 10000, max_members: int = 10000, max_channels: int = 2000, max_messages: int = 1000, ttl: Optional[float] = 300.0):
+        self.users: LRUCache = LRUCache("users", max_size = max_users, ttl = ttl)
+        self.members: LRUCache = LRUCache("members", max_size = max_members, ttl = ttl)
+        self.channels: LRUCache = LRUCache("channels", max_size = max_channels, ttl = ttl)
+        self.messages: LRUCache = LRUCache("messages", max_size = max_messages, ttl = ttl)
+
+    def add_user(self, user):
+        return self.users.set(user.id, user)
+
+    def add_member(self, guild_id: Union[str, int], member):
+        if member.user:
+            self.add_user(member.user)
+        # Members without a user (e.g. in some message payloads) have no id to be found by.
+        if guild_id is None or member.id is None:
+            return member
+        return self.members.set((Snowflake(guild_id), member.id), member)
+
+    def add_channel(self, channel):
+        return self.channels.set(channel.id, channel)
+
+    def add_message(self, message):
+        if message.author is not None and hasattr(message.author, "id"):
+            self.add_user(message.author)
+        return self.messages.set(message.id, message)
+
+    # Objects are stored under their Snowflake ids, ids passed as strings are converted so they find them.
+    def get_user(self, id: Union[str, int]):
+        return self.users.get(Snowflake(id))
+
+    def get_member(self, guild_id: Union[str, int], user_id: Union[str, int]):
+        if guild_id is None:
+            return None
+        return self.members.get((Snowflake(guild_id), Snowflake(user_id)))
+
+    def get_channel(self, id: Union[str, int]):
+        return self.channels.get(Snowflake(id))
+
+    def get_message(self, id: Union[str, int]):
+        return self.messages.get(Snowflake(id))
+
+    def clear(self):
+        for cache in (self.users, self.members, self.channels, self.messages):
+            cache.clear()
+
+    def stats(self) -> dict:
+        return {cache.name: cache.stats() for cache in (self.users, self.members, self.channels, self.messages)}
+
+
+def cache_of(client) -> Optional[EntityCache]:
+    """
+    The client's cache, if it has one. Models are also built with stand-in clients, e.g. in benchmarks.
+    """
+    return getattr(client, "cache", None)
@@ -1,4 +1,4 @@
-from components import *
+from .components import *
 from logging import getLogger
 from .overwrite import Overwrite
 from .file import File
@@ -11,76 +11,37 @@ from typing import (
 from .mentioned import *
 from .message import *
 from .partials import PartialUser
+from .messageable import GuildMessageable, Messageable
+from .scheduler import Priority
+from .exceptions import HTTPException
+from .pagination import Paginator
+from .cache import cache_of
+from .snowflake import Snowflake, snowflake
+from .registry import TypeRegistry
 
 
 logger = getLogger(__name__)
 
 
 class BaseChannel:
+    __slots__ = ("id", "client", "type")
+
     def __init__(self, client, data: dict):
-        self.id: str = data.get("id")
+        self.id: Snowflake = snowflake(data.get("id"))
         self.client = client
         self.type = data.get("type")
 
-class Messageable:
-    def __init__(self, client, channel_id: str):
-        self.id: str = channel_id
-        self.client = client
-
-    async def fetch_messages(self, *, around: Optional[str] = None, before: Optional[str] = None, after: Optional[str] = None, limit: Optional[int] = None) -> List[Message]:
-        response = await self.client.http.get(f"channels/{self.id}/messages", params={"around": around, "before": before, "after": after, "limit": limit})
-        data = await response.json()
-        return [Message(self.client, message) for message in data]
-
-    async def fetch_message(self, *, message_id: str) -> Message:
-        response = await self.client.http.get(f"channels/{self.id}/messages/{message_id}")
-        data = await response.json()
-        return Message(self.client, data)
-
-    async def send(self, content: Optional[str] = None, *, embeds: Optional[List[dict]] = None, components=None, tts: Optional[bool] = False, allowed_mentions=None, sticker_ids: Optional[List[str]] = None, attachments: List[File]=None, suppress_embeds: bool = False) -> Message:
-        payload = {}
-
-        if content:
-            payload["content"] = content
-
-        if embeds:
-            payload["embeds"] = [embed.to_dict() for embed in embeds]
-
-        if components:
-            payload["components"] = [component.to_dict()
-                                     for component in components]
-
-        if tts:
-            payload["tts"] = tts
-
-        if allowed_mentions:
-            payload["allowed_mentions"] = allowed_mentions.to_dict()
-
-        if sticker_ids:
-            payload["sticker_ids"] = sticker_ids
-
-        if attachments:
-            payload["attachments"] = [attachment.to_dict()
-                                      for attachment in attachments]
-
-        if suppress_embeds:
-            payload["suppress_embeds"] = 1 << 2
-
-        response = await self.client.http.post(f"channels/{self.id}/messages", json=payload)
-        data = await response.json()
-        return Message(self.client, data)
-
 class GuildChannel(BaseChannel):
+    __slots__ = ("guild_id", "position", "nsfw", "permission_overwrites", "parent_id", "name")
+
     def __init__(self, client, data: dict):
         super().__init__(client, data)
-        if data["type"] == 0:
-            return channel_from_type(client, data).to_type()
-        self.guild_id: str = data.get("guild_id")
+        self.guild_id: Snowflake = snowflake(data.get("guild_id"))
         self.position: int = data.get("position")
         self.nsfw: bool = data.get("nsfw")
         self.permission_overwrites: list[dict] = data.get(
             "permission_overwrites")
-        self.parent_id: str = data.get("parent_id")
+        self.parent_id: Snowflake = snowflake(data.get("parent_id"))
         self.name: str = data.get("name")
 
     async def delete(self, *, reason: Optional[str] = None) -> None:
@@ -114,7 +75,12 @@ class GuildChannel(BaseChannel):
     async def fetch_pinned_messages(self) -> List[Message]:
         response = await self.client.http.get(f"/channels/{self.id}/pins")
         data = await response.json()
-        return [Message(self.client, message) for message in data]
+        messages = [Message(self.client, message) for message in data]
+        cache = cache_of(self.client)
+        if cache:
+            for message in messages:
+                cache.add_message(message)
+        return messages
 
     # async def edit_permission_overwrites I'll do this later
 
@@ -132,12 +98,14 @@ class GuildChannel(BaseChannel):
     #     data = await response.json()
     #     return GuildChannel(self.client, data)
 
-class GuildTextChannel(GuildChannel, Messageable):
+class GuildTextChannel(GuildChannel, GuildMessageable):
+    __slots__ = ("topic", "rate_limit_per_user", "last_message_id", "default_auto_archive_duration")
+
     def __init__(self, client, data: dict):
         super().__init__(client, data)
         self.topic: str = data.get("topic")
         self.rate_limit_per_user: int = data.get("rate_limit_per_user")
-        self.last_message_id: str = data.get("last_message_id")
+        self.last_message_id: Snowflake = snowflake(data.get("last_message_id"))
         self.default_auto_archive_duration: int = data.get(
             "default_auto_archive_duration")
 
@@ -151,7 +119,7 @@ class GuildTextChannel(GuildChannel, Messageable):
         # TODO Add support for avatars.
         await self.client.http.post(f"/channels/{self.id}/webhooks", json=data, headers=headers)
 
-    async def start_thread(self, name: str, *, auto_archive_duration: Optional[int], type: Optional[int], invitable: Optional[bool], rate_limit_per_user: Optional[int], reason: Optional[str]):
+    async def start_thread(self, name: str, *, auto_archive_duration: Optional[int] = None, type: Optional[int] = None, invitable: Optional[bool] = None, rate_limit_per_user: Optional[int] = None, reason: Optional[str] = None):
         data = {"name": name}
         if auto_archive_duration:
             data["auto_archive_duration"] = auto_archive_duration
@@ -162,35 +130,51 @@ class GuildTextChannel(GuildChannel, Messageable):
         if rate_limit_per_user:
             data["rate_limit_per_user"] = rate_limit_per_user
 
-        headers = self.client.http.headers.copy()
-        headers["X-Audit-Log-Reason"] = reason
+        headers = {"X-Audit-Log-Reason": reason} if reason else None
 
-        response = await self.client.http.post(f"/channels/{self.id}/threads", data=data, headers=headers)
-        self.client.guilds[self.guild_id].append(Thread(await response.json()))
-
-    async def bulk_delete(self, message_ids: List[str], reason: Optional[str]) -> None:
-
-        if reason:
-            headers = self.client.http.headers.copy()
-            headers["X-Audit-Log-Reason"] = reason
-
-        response = await self.client.http.post(f"channels/{self.id}/messages/bulk-delete", data={"messages": message_ids}, headers=headers)
-        return await response.json()
+        response = await self.client.http.post(f"/channels/{self.id}/threads", json=data, headers=headers)
+        thread = channel_from_type(self.client, await response.json())
+        cache = cache_of(self.client)
+        return cache.add_channel(thread) if cache else thread
 
     # It returns a List of Threads but I can't typehint that...
     async def list_public_archived_threads(self, *, before: Optional[str], limit: Optional[int]) -> Dict[str, Union[List[Messageable], List[ThreadMember], bool]]:
-        response = await self.client.http.get(f"/channels/{self.id}/threads/archived/public", params={"before": before, "limit": limit})
+        response = await self.client.http.get(f"/channels/{self.id}/threads/archived/public", params={"before": before, "limit": limit}, priority=Priority.BACKGROUND)
         return await response.json()
 
     # It returns a List of Threads but I can't typehint that...
     async def list_private_archived_threads(self, *, before: Optional[str], limit: Optional[int]) -> Dict[str, Union[List[Messageable], List[ThreadMember], bool]]:
-        response = await self.client.http.get(f"/channels/{self.id}/threads/archived/private", params={"before": before, "limit": limit})
+        response = await self.client.http.get(f"/channels/{self.id}/threads/archived/private", params={"before": before, "limit": limit}, priority=Priority.BACKGROUND)
         return await response.json()
 
     async def list_joined_private_archived_threads(self, *, before: Optional[str], limit: Optional[int]) -> Dict[str, Union[List[Messageable], List[ThreadMember], bool]]:
-        response = await self.client.http.get(f"/channels/{self.id}/threads/archived/private", params={"before": before, "limit": limit})
+        response = await self.client.http.get(f"/channels/{self.id}/users/@me/threads/archived/private", params={"before": before, "limit": limit}, priority=Priority.BACKGROUND)
         return await response.json()
 
+    def iter_public_archived_threads(self, *, before: Optional[str] = None, limit: Optional[int] = None, prefetch: bool = True) -> Paginator:
+        """
+        Iterates over the channel's archived public threads, most recently archived first. Use with `async for`, the pages are fetched as they're needed.
+        """
+        return self._iter_archived_threads(f"channels/{self.id}/threads/archived/public", lambda thread: thread["thread_metadata"]["archive_timestamp"], before, limit, prefetch)
+
+    def iter_private_archived_threads(self, *, before: Optional[str] = None, limit: Optional[int] = None, prefetch: bool = True) -> Paginator:
+        return self._iter_archived_threads(f"channels/{self.id}/threads/archived/private", lambda thread: thread["thread_metadata"]["archive_timestamp"], before, limit, prefetch)
+
+    def iter_joined_private_archived_threads(self, *, before: Optional[str] = None, limit: Optional[int] = None, prefetch: bool = True) -> Paginator:
+        # This one pages by thread id rather than by when it was archived.
+        return self._iter_archived_threads(f"channels/{self.id}/users/@me/threads/archived/private", lambda thread: thread["id"], before, limit, prefetch)
+
+    def _iter_archived_threads(self, url: str, cursor_of: callable, before: Optional[str], limit: Optional[int], prefetch: bool) -> Paginator:
+        async def fetch_page(cursor: Optional[str], page_limit: int):
+            params = {name: value for name, value in {"before": cursor, "limit": page_limit}.items() if value is not None}
+            response = await self.client.http.get(url, params=params, priority=Priority.BACKGROUND)
+            if response.status >= 400:
+                raise HTTPException(f"Fetching the archived threads of channel ({self.id}) failed with status {response.status}.")
+            data = await response.json()
+            return data["threads"], data.get("has_more", False)
+
+        return Paginator(fetch_page, cursor = before, cursor_of = cursor_of, parse = lambda thread: channel_from_type(self.client, thread), limit = limit, prefetch = prefetch)
+
     # async def edit(self,*, name: Optional[str], position: Optional[str], permission_overwrites: Optional[List[dict]], reason: Optional[str], topic: Optional[str], nsfw: bool, rate_limit_per_user: Optional[int], parent_id: Optional[int], default_auto_archive_duration: Optional[int]):
     #     data = {}
     #     if name:
@@ -208,6 +192,8 @@ class GuildTextChannel(GuildChannel, Messageable):
 
 
 class GuildNewsChannel(GuildTextChannel):
+    __slots__ = ()
+
     def __init__(self, client, data: dict):
         super().__init__(client, data)
         self.default_auto_archive_duration: int = data.get(
@@ -219,6 +205,8 @@ class GuildNewsChannel(GuildTextChannel):
 
 
 class VoiceChannel(GuildChannel):
+    __slots__ = ("bitrate", "user_limit", "rtc_region")
+
     def __init__(self, client, data: dict):
         super().__init__(client, data)
         self.bitrate: int = data.get("bitrate")
@@ -226,54 +214,55 @@ class VoiceChannel(GuildChannel):
         self.rtc_region: str = data.get("rtc_region")
 
 
-class DMChannel(BaseChannel):
+class DMChannel(BaseChannel, Messageable):
+    __slots__ = ("recipient",)
+
     def __init__(self, client, data: dict):
         super().__init__(client, data)
         self.recipient: List[PartialUser] = PartialUser(data.get("recipient"))
 
 
 class ChannelCategory(GuildChannel):
+    __slots__ = ()
+
     def __init__(self, client, data: dict):
         super().__init__(client, data)
 
 
 class GuildStoreChannel(GuildChannel):
+    __slots__ = ()
+
     def __init__(self, client, data: dict):
         super().__init__(client, data)
 
 
-class GuildNewsThread(Thread, GuildNewsChannel):
-    def __init__(self, client, data: dict):
-        super().__init__(client, data)
+class GuildNewsThread(Thread):
+    __slots__ = ()
 
 
 class GuildStageChannel(BaseChannel):
+    __slots__ = ("guild_id", "channel_id", "privacy_level", "discoverable_disabled")
+
     def __init__(self, client, data: dict):
         super().__init__(client, data)
-        self.guild_id: str = data.get("guild_id")
-        self.channel_id: str = data.get("channel_id")
+        self.guild_id: Snowflake = snowflake(data.get("guild_id"))
+        self.channel_id: Snowflake = snowflake(data.get("channel_id"))
         self.privacy_level: int = data.get("privacy_level")
         self.discoverable_disabled: bool = data.get("discoverable_disabled")
 
-def channel_from_type(self, channel_data: dict):
-    channel_type = channel_data.get("type")
-    if channel_type == 0:
-        return GuildTextChannel(self.client, channel_data)
-    elif channel_type == 1:
-        return DMChannel(self.client, channel_data)
-    elif channel_type == 2:
-        return VoiceChannel(self.client, channel_data)
-    elif channel_type == 4:
-        return ChannelCategory(self.client, channel_data)
-    elif channel_type == 5:
-        return GuildNewsChannel(self.client, channel_data)
-    elif channel_type == 6:
-        return GuildStoreChannel(self.client, channel_data)
-    elif channel_type == 10:
-        return GuildNewsThread(self.client, channel_data)
-    elif channel_type == 11:
-        return Thread(self.client, channel_data)
-    elif channel_type == 12:
-        return PrivateThread(self.client, channel_data)
-    elif channel_type == 13:
-        return GuildStageChannel(self.client, channel_data)
\ No newline at end of file
+# Unknown channel types still get their id and type.
+channel_registry = TypeRegistry("channel", fallback = BaseChannel)
+channel_registry.register(0, GuildTextChannel)
+channel_registry.register(1, DMChannel)
+channel_registry.register(2, VoiceChannel)
+channel_registry.register(4, ChannelCategory)
+channel_registry.register(5, GuildNewsChannel)
+channel_registry.register(6, GuildStoreChannel)
+channel_registry.register(10, GuildNewsThread)
+channel_registry.register(11, Thread)
+channel_registry.register(12, PrivateThread)
+channel_registry.register(13, GuildStageChannel)
+
+
+def channel_from_type(client, channel_data: dict) -> BaseChannel:
+    return channel_registry.get(channel_data.get("type"))(client, channel_data)
@@ -0,0 +1,47 @@
+"""
+The JSON codec used for everything going to and coming from Discord.
+
+orjson is used if it's installed, then msgspec, and the standard library otherwise. Both :func:`dumps` and :func:`loads` work with bytes so nothing has to be decoded to a str first.
+
+:data:`DecodeError` is what :func:`loads` raises for a body that isn't JSON, whatever the backend.
+
+:data:`fragment` wraps JSON that's already encoded so :func:`dumps` writes it out as it is, it's None when the backend can't do that (the standard library and orjson before 3.9).
+"""
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+if orjson:
+    backend: str = "orjson"
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    loads = orjson.loads
+    DecodeError = ValueError
+    fragment = getattr(orjson, "Fragment", None)
+
+elif msgspec:
+    backend: str = "msgspec"
+
+    dumps = msgspec.json.Encoder().encode
+    loads = msgspec.json.Decoder().decode
+    DecodeError = (msgspec.DecodeError, ValueError)
+    fragment = msgspec.Raw
+
+else:
+    import json
+    backend: str = "json"
+
+    def dumps(obj) -> bytes:
+        return json.dumps(obj, separators = (",", ":"), ensure_ascii = False).encode()
+
+    loads = json.loads
+    DecodeError = ValueError
+    fragment = None
@@ -1,7 +1,24 @@
 from typing import (
+    Any,
     Union, 
     Optional
 )
+from .registry import TypeRegistry, RawObject
+from .serialization import Serializable
+
+class _Missing:
+    """
+    The default of arguments where None means something, e.g. a command's `defer_after`, where None turns automatic deferring off and leaving it out uses the Interface's.
+    """
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+    def __bool__(self) -> bool:
+        return False
+
+MISSING: Any = _Missing()
 
 class ChannelOptionChannelTypes:
     GUILD_TEXT = 0
@@ -16,7 +33,7 @@ class ChannelOptionChannelTypes:
     GUILD_STAGE_VOICE = 13
 
 
-class BaseSlashCommandOption:
+class BaseSlashCommandOption(Serializable):
     def __init__(self, *, name: str, description: str, required: Optional[bool] = False):
         self.name: str = name
         self.description: str = description
@@ -24,7 +41,11 @@ class BaseSlashCommandOption:
         self.type: int = None # Needs to be set by the subclass
         # People shouldn't use this class, this is just a base class for other options, but they can use this for other options we are yet to account for.
 
-    def to_dict(self):
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(**{key: value for key, value in data.items() if key != "type"})
+
+    def _to_dict(self):
         return {
             "name": self.name,
             "description": self.description,
@@ -38,8 +59,8 @@ class StringOption(BaseSlashCommandOption):
         self.type = 3
         self.autocomplete = autocomplete
 
-    def to_dict(self):
-        usual_dict = super().to_dict()
+    def _to_dict(self):
+        usual_dict = super()._to_dict()
         usual_dict["autocomplete"] = self.autocomplete
         return usual_dict
 
@@ -52,8 +73,8 @@ class IntegerOption(BaseSlashCommandOption):
         self.min_value = min_value
         self.max_value = max_value
 
-    def to_dict(self):
-        usual_dict = super().to_dict()
+    def _to_dict(self):
+        usual_dict = super()._to_dict()
         usual_dict["autocomplete"] = self.autocomplete
         if self.min_value:
             usual_dict["min_value"] = self.min_value
@@ -79,8 +100,8 @@ class ChannelOption(BaseSlashCommandOption):
         self.type = 7
         self.channel_types: list[ChannelOptionChannelTypes] = []
         
-    def to_dict(self):
-        usual_dict: dict = super().to_dict()
+    def _to_dict(self):
+        usual_dict: dict = super()._to_dict()
         usual_dict["channel_types"] = self.channel_types
         return usual_dict
 
@@ -104,8 +125,8 @@ class NumberOption(BaseSlashCommandOption):
         self.min_value = min_value
         self.max_value = max_value
 
-    def to_dict(self):
-        usual_dict = super().to_dict()
+    def _to_dict(self):
+        usual_dict = super()._to_dict()
         usual_dict["autocomplete"] = self.autocomplete
         if self.min_value:
             usual_dict["min_value"] = self.min_value
@@ -119,12 +140,12 @@ class AttachmentOption(BaseSlashCommandOption):
         self.type = 11
 
 
-class SlashCommandOptionChoice:
-    def __init__(self, * name: str, value: Union[float, int, str]):
+class SlashCommandOptionChoice(Serializable):
+    def __init__(self, *, name: str, value: Union[float, int, str]):
         self.name: str = name
         self.value: Union[float, int, str] = value
     
-    def to_dict(self):
+    def _to_dict(self):
         return {
             "name": self.name,
             "value": self.value
@@ -134,35 +155,29 @@ class InvalidOption(Exception):
     ...
 
 class Subcommand(BaseSlashCommandOption):
-    def __init__(self, *, name: str, description: str = None, required: bool = False, options: list[Union[StringOption, IntegerOption, BooleanOption, UserOption, ChannelOption, RoleOption, MentionableOption, NumberOption]] = None):
+    def __init__(self, *, name: str, description: str = None, required: bool = False, options: list[Union[StringOption, IntegerOption, BooleanOption, UserOption, ChannelOption, RoleOption, MentionableOption, NumberOption]] = None, callback: Optional[callable] = None):
         super().__init__(name=name, description=description, required=required)
         self.type = 1
-        converted_options = []
-        for option in options:
-            if option["type"] == 1:
-                converted_options.append(Subcommand(**option))
-            elif option["type"] == 2:
-                raise InvalidOption("You can't have a subcommand group with a subcommand")
-            elif option["type"] == 3:
-                converted_options.append(StringOption(**option))
-            elif option["type"] == 4:
-                converted_options.append(IntegerOption(**option))
-            elif option["type"] == 5:
-                converted_options.append(BooleanOption(**option))
-            elif option["type"] == 6:
-                converted_options.append(UserOption(**option))
-            elif option["type"] == 7:
-                converted_options.append(ChannelOption(**option))
-            elif option["type"] == 8:
-                converted_options.append(RoleOption(**option))
-            elif option["type"] == 9:
-                converted_options.append(MentionableOption(**option))
-            elif option["type"] == 10:
-                converted_options.append(NumberOption(**option))
-            elif option["type"] == 11:
-                converted_options.append(AttachmentOption(**option))
-
-        self.opions: Union[Subcommand, SubCommandGroup, StringOption, IntegerOption, BooleanOption, UserOption, ChannelOption, RoleOption, MentionableOption, NumberOption] = converted_options
+        self.callback: Optional[callable] = callback
+        converted_options = convert_options(options)
+        if any(isinstance(option, SubCommandGroup) for option in converted_options):
+            raise InvalidOption("You can't have a subcommand group with a subcommand")
+
+        self.options: Union[Subcommand, SubCommandGroup, StringOption, IntegerOption, BooleanOption, UserOption, ChannelOption, RoleOption, MentionableOption, NumberOption] = converted_options
+
+    def routes(self, fallback: Optional[callable] = None):
+        """
+        Yields the `(path, callback)` pairs this subcommand can be invoked through.
+        """
+        yield (self.name,), self.callback or fallback
+
+    def _children(self):
+        return self.options
+
+    def _to_dict(self):
+        usual_dict = super()._to_dict()
+        usual_dict["options"] = list(self._parts)
+        return usual_dict
 
 
 
@@ -171,50 +186,63 @@ class SubCommandGroup(BaseSlashCommandOption):
     def __init__(self, *, name: str, description: str = None, required: bool = False, options: list[Union[Subcommand, StringOption, IntegerOption, BooleanOption, UserOption, ChannelOption, RoleOption, MentionableOption, NumberOption]] = None):
         super().__init__(name=name, description=description, required=required)
         self.type = 2
-        converted_options = []
-        for option in options:
-            if option["type"] == 1:
-                converted_options.append(Subcommand(**option))
-            elif option["type"] == 2:
-                converted_options.append(SubCommandGroup(**option))
-            elif option["type"] == 3:
-                converted_options.append(StringOption(**option))
-            elif option["type"] == 4:
-                converted_options.append(IntegerOption(**option))
-            elif option["type"] == 5:
-                converted_options.append(BooleanOption(**option))
-            elif option["type"] == 6:
-                converted_options.append(UserOption(**option))
-            elif option["type"] == 7:
-                converted_options.append(ChannelOption(**option))
-            elif option["type"] == 8:
-                converted_options.append(RoleOption(**option))
-            elif option["type"] == 9:
-                converted_options.append(MentionableOption(**option))
-            elif option["type"] == 10:
-                converted_options.append(NumberOption(**option))
-            elif option["type"] == 11:
-                converted_options.append(AttachmentOption(**option))
-
-        self.opions: Union[Subcommand, SubCommandGroup, StringOption, IntegerOption, BooleanOption, UserOption, ChannelOption, RoleOption, MentionableOption, NumberOption] = converted_options
+        converted_options = convert_options(options)
 
-    def to_dict(self):
-        usual_dict = super().to_dict()
-        payload_to_append = []
-        for option in self.opions:
-            payload_to_append(option.to_dict())
-        
-        usual_dict["options"] = payload_to_append
+        self.options: Union[Subcommand, SubCommandGroup, StringOption, IntegerOption, BooleanOption, UserOption, ChannelOption, RoleOption, MentionableOption, NumberOption] = converted_options
+
+    def routes(self, fallback: Optional[callable] = None):
+        for option in self.options:
+            if isinstance(option, (Subcommand, SubCommandGroup)):
+                for path, callback in option.routes(fallback):
+                    yield (self.name,) + path, callback
+
+    def _children(self):
+        return self.options
+
+    def _to_dict(self):
+        usual_dict = super()._to_dict()
+        usual_dict["options"] = list(self._parts)
         return usual_dict
 
 
+# Option types the library doesn't know yet are kept as they are and sent back unchanged.
+option_registry = TypeRegistry("option", fallback = RawObject)
+option_registry.register(1, Subcommand.from_dict)
+option_registry.register(2, SubCommandGroup.from_dict)
+option_registry.register(3, StringOption.from_dict)
+option_registry.register(4, IntegerOption.from_dict)
+option_registry.register(5, BooleanOption.from_dict)
+option_registry.register(6, UserOption.from_dict)
+option_registry.register(7, ChannelOption.from_dict)
+option_registry.register(8, RoleOption.from_dict)
+option_registry.register(9, MentionableOption.from_dict)
+option_registry.register(10, NumberOption.from_dict)
+option_registry.register(11, AttachmentOption.from_dict)
+
+
+def convert_options(options: Optional[list]) -> list:
+    """
+    Turns the options given as dicts into option objects, options that are already objects are kept as they are.
+    """
+    return [option if isinstance(option, (BaseSlashCommandOption, RawObject)) else option_registry.get(option["type"])(option) for option in options or []]
+
+
 AnyOption = Union[Subcommand, SubCommandGroup, StringOption, IntegerOption, BooleanOption, UserOption, ChannelOption, RoleOption, MentionableOption, NumberOption]
 
 
 class UserCommand:
-    def __init__(self, *, name: str, callback: callable):
+    """
+    Attributes:
+    -----------
+    defer_after: Optional[float] How many seconds the callback has to respond before it's automatically deferred. None never defers it, MISSING uses the Interface's `defer_after`.
+    defer_ephemeral: bool Whether the automatic deferral is ephemeral, so the reply that fills it in is only seen by the user.
+    """
+    def __init__(self, *, name: str, callback: callable, defer_after: Optional[float] = MISSING, defer_ephemeral: bool = False):
         self.name: str = name
         self.callback: callable = callback
+        self.type: int = 2
+        self.defer_after: Optional[float] = defer_after
+        self.defer_ephemeral: bool = defer_ephemeral
     
     def to_dict(self):
         return {
@@ -225,12 +253,20 @@ class UserCommand:
     def to_discord_command_dict(self):
         return {
             "name": self.name,
-            "type": 2
+            "type": self.type
         }
 
+    def routes(self):
+        """
+        Yields the `(path, callback)` pairs this command can be invoked through. Only Slash Commands have more than the one.
+        """
+        yield (), self.callback
+
 class SlashCommand(UserCommand):
-    def __init__(self, *, name: str, description: str, callback: callable, guild_ids: Optional[list[str]], options: Optional[list[AnyOption]]):
-        super().__init__(name = name, description = description, callback = callback)
+    def __init__(self, *, name: str, description: str, callback: callable, guild_ids: Optional[list[str]], options: Optional[list[AnyOption]], defer_after: Optional[float] = MISSING, defer_ephemeral: bool = False):
+        super().__init__(name = name, callback = callback, defer_after = defer_after, defer_ephemeral = defer_ephemeral)
+        self.type: int = 1
+        self.description: str = description
         self.guild_ids: list[str] | None = guild_ids
         self.options: list[AnyOption] | None = options
 
@@ -242,6 +278,12 @@ class SlashCommand(UserCommand):
             usual_dict["options"] = self.options
         return usual_dict
     
+    def routes(self):
+        yield (), self.callback
+        for option in self.options or []:
+            if isinstance(option, (Subcommand, SubCommandGroup)):
+                yield from option.routes(self.callback)
+
     def to_discord_command_dict(self):
         usual_dict = super().to_discord_command_dict()
         if self.guild_ids:
@@ -251,6 +293,6 @@ class SlashCommand(UserCommand):
         return usual_dict
 
 class MessageCommand(UserCommand):
-    def to_discord_command_dict(self):
-        usual_dict = super().to_discord_command_dict()
-        usual_dict["type"] = 3
\ No newline at end of file
+    def __init__(self, *, name: str, callback: callable, defer_after: Optional[float] = MISSING, defer_ephemeral: bool = False):
+        super().__init__(name = name, callback = callback, defer_after = defer_after, defer_ephemeral = defer_ephemeral)
+        self.type: int = 3
@@ -1,12 +1,14 @@
 from .exceptions import *
 from .partials import PartialEmoji
+from .registry import TypeRegistry, RawObject
+from .serialization import Serializable
 from typing import (
     Optional,
     List,
     Union
 )
 
-class BaseComponent:
+class BaseComponent(Serializable):
     def __init__(self, *, custom_id: str):
         self.custom_id: str = custom_id
 
@@ -18,9 +20,10 @@ class BaseComponent:
         elif len(custom_id) > 100:
             raise CustomIdIsTooBig("Custom Id must be 100 characters or less.")
 
-        self.settings["custom_id"] = custom_id
+        self.custom_id = custom_id
+        return self
 
-class MessageSelectMenuOption:
+class MessageSelectMenuOption(Serializable):
     def __init__(self, label: str, value: str, description: Optional[str] = None, emoji: Optional[PartialEmoji] = None, default: Optional[bool] = None):
         self.label: str = label
         self.value: str = value
@@ -28,7 +31,7 @@ class MessageSelectMenuOption:
         self.emoji: Optional[PartialEmoji] = emoji
         self.default: Optional[bool] = default
 
-    def to_dict(self):
+    def _to_dict(self):
         settings = {
             "label": self.label,
             "value": self.value
@@ -58,51 +61,65 @@ class MessageSelectMenu(BaseComponent):
         self.min_values = min_values
         self.max_values = max_values
         self.disabled: bool = disabled
+        self.placeholder: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        select_menu = cls(min_values = data.get("min_values", 1), max_values = data.get("max_values", 1), disabled = data.get("disabled", False), custom_id = data.get("custom_id"))
+        select_menu.options = data.get("options", [])
+        select_menu.placeholder = data.get("placeholder")
+        return select_menu
+
+    def _children(self):
+        return self.options
 
-    def to_dict(self):
+    def _to_dict(self):
         settings = {
             "type": self.type,
-            "options": self.options,
+            "options": list(self._parts),
             "min_values": self.min_values,
             "max_values": self.max_values,
             "disabled": self.disabled,
             "custom_id": self.custom_id
         }
+        if self.placeholder:
+            settings["placeholder"] = self.placeholder
         return settings
 
     def add_options(self, options: List[MessageSelectMenuOption]):
         for option in options:
 
-            if len(self.options) > 25:
+            if len(self.options) >= 25:
                 raise TooManySelectMenuOptions(
                     "You can only have 25 options in a select menu.")
 
-            self.options.append(option.to_dict())
+            self.options.append(option)
         return self
 
     def set_placeholder(self, placeholder: str):
         if not isinstance(placeholder, str):
             raise InvalidArgumentType("Placeholder must be a string.")
 
-        self.settings["placeholder"] = placeholder
+        self.placeholder = placeholder
         return self
 
     def set_min_values(self, min: int):
         if not isinstance(min, int):
             raise InvalidArgumentType("Min must be an integer.")
 
-        self.options["min_values"] = min
+        self.min_values = min
         return self
 
     def set_max_values(self, max: int):
         if not isinstance(max, int):
             raise InvalidArgumentType("Max must be an integer.")
 
-        self.options["max_values"] = max
+        self.max_values = max
         return self
 
     def set_disabled(self, disabled: bool):
         self.disabled = disabled
+        return self
 
 
 class MessageTextInput(BaseComponent):
@@ -123,6 +140,7 @@ class MessageTextInput(BaseComponent):
             if style not in VALID_STYLES.values():
                 raise InvalidComponentStyle("Style must be either 1 or 2.")
 
+        self.type: int = 4
         self.style: int = style
         self.label: str = label
         self.min_length: int = min_length
@@ -131,9 +149,14 @@ class MessageTextInput(BaseComponent):
         self.value: str = value
         self.placeholder: Optional[str] = placeholder
 
-    def to_dict(self):
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(custom_id = data.get("custom_id"), style = data.get("style", 1), label = data.get("label"), min_length = data.get("min_length"), max_length = data.get("max_length"), required = data.get("required", True), value = data.get("value"), placeholder = data.get("placeholder"))
+
+    def _to_dict(self):
         settings: dict = {
             "type": self.type,
+            "custom_id": self.custom_id,
             "label": self.label,
             "min_length": self.min_length,
             "max_length": self.max_length,
@@ -147,6 +170,8 @@ class MessageTextInput(BaseComponent):
         if getattr(self, "placeholder", None):
             settings["placeholder"] = self.placeholder
 
+        return settings
+
 
 class MessageButton(BaseComponent):
     def __init__(self, *, style: Optional[Union[int, str]] = 1, label: Optional[str] = None, emoji: Optional[Union[PartialEmoji, dict]] = None, url: Optional[str] = None, custom_id: str, disabled: bool = False):
@@ -181,6 +206,10 @@ class MessageButton(BaseComponent):
         if label:
             self.label: Optional[str] = label
 
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(style = data.get("style", 1), label = data.get("label"), emoji = data.get("emoji"), url = data.get("url"), custom_id = data.get("custom_id"), disabled = data.get("disabled", False))
+
     @property
     def PRIMARY(self):
         self.style = 1
@@ -206,14 +235,17 @@ class MessageButton(BaseComponent):
         self.style = 5
         return self 
 
-    def to_dict(self):
+    def _to_dict(self):
         settings = {
             "type": self.type,
-            "custom_id": self.custom_id,
             "disabled": self.disabled,
             "style": self.style,
         }
 
+        # Link buttons can't have a custom id.
+        if self.custom_id:
+            settings["custom_id"] = self.custom_id
+
         if getattr(self, "label", None):
             settings["label"] = self.label
 
@@ -221,7 +253,7 @@ class MessageButton(BaseComponent):
             settings["url"] = self.url
 
         if getattr(self, "emoji", None):
-            settings["emoji"] = self.emoji
+            settings["emoji"] = self.emoji.to_dict() if isinstance(self.emoji, PartialEmoji) else self.emoji
 
         return settings
 
@@ -233,7 +265,7 @@ class MessageButton(BaseComponent):
         if len(label) > 80:
             raise LabelIsTooBig("Label must be 80 characters or less.")
 
-        self.settings["label"] = label
+        self.label = label
         return self
 
     def set_style(self, style: Union[int, str]):
@@ -248,24 +280,20 @@ class MessageButton(BaseComponent):
             if style.upper() not in valid_styles:
                 raise InvalidComponentStyle(
                     "Invalid button style. Style must be one of PRIMARY, SECONDARY, LINK, DANGER, or SUCCESS.")
-            self.settings["style"] = valid_styles[style.upper()]
+            self.style = valid_styles[style.upper()]
             return self
 
         elif isinstance(style, int):
             if style not in valid_styles.values():
                 raise InvalidComponentStyle(
                     "Invalid button style. Style must be in range 1 to 5 inclusive.")
-            self.settings["style"] = style
+            self.style = style
             return self
 
     def set_emoji(self, emoji: Union[PartialEmoji, dict]):
 
-        if isinstance(emoji, dict):
-            self.settings["emoji"] = emoji
-            return self
-
-        elif isinstance(emoji, PartialEmoji):
-            self.settings["emoji"] = emoji.data
+        if isinstance(emoji, (dict, PartialEmoji)):
+            self.emoji = emoji
             return self
         raise InvalidArgumentType(
             "Emoji must be a PartialEmoji or a dict that represents a PartialEmoji.")
@@ -275,8 +303,8 @@ class MessageButton(BaseComponent):
         if not isinstance(url, str):
             raise InvalidArgumentType("Url must be a string.")
 
-        self.settings["url"] = url
-        self.settings["style"] = 5
+        self.url = url
+        self.style = 5
         return self
 
 
@@ -284,19 +312,22 @@ class MissingCustomId(Exception):
     ...
 
 
-class MessageActionRow:
+class MessageActionRow(Serializable):
     def __init__(self, components: Optional[List[Union[MessageButton, MessageSelectMenu]]] = None):
-        self.settings = {
-            "type": 1,
-            "components": components or []
-        }
         self.type: int = 1
         self.components: List[Union[MessageTextInput, MessageButton, MessageSelectMenu]] = components or []
 
-    def to_dict(self):
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls([component_from_type(component) for component in data.get("components", [])])
+
+    def _children(self):
+        return self.components
+
+    def _to_dict(self):
         return {
             "type": self.type,
-            "components": [component for component in self.components]
+            "components": list(self._parts)
         }
 
     def add_components(self, components: List[Union[MessageButton, MessageSelectMenu]]):
@@ -315,6 +346,17 @@ class MessageActionRow:
             elif type(component) == MessageSelectMenu and buttons > 0:
                 raise TooManyComponents(
                     "You can only have 1 select menu per row. No buttons along that select menu.")
-            self.components.append(component.to_dict())
+            self.components.append(component)
         return self
 
+
+# Component types the library doesn't know yet are kept as they are and sent back unchanged.
+component_registry = TypeRegistry("component", fallback = RawObject)
+component_registry.register(1, MessageActionRow.from_dict)
+component_registry.register(2, MessageButton.from_dict)
+component_registry.register(3, MessageSelectMenu.from_dict)
+component_registry.register(4, MessageTextInput.from_dict)
+
+
+def component_from_type(data: dict):
+    return component_registry.get(data.get("type"))(data)
@@ -1,6 +1,8 @@
 from typing import Optional, List, Any, Tuple, Type, TypeVar
 
 from datetime import datetime
+from .serialization import Serializable
+from .exceptions import EmbedLimitExceeded
 
 CT = TypeVar('CT', bound='Colour')
 T = TypeVar('T')
@@ -135,13 +137,100 @@ class Colour:
 
 Color = Colour
 
-class Embed:  # Always wanted to make this class :D
+# Discord's limits on embeds, all in characters except the field and embed counts.
+MAX_EMBED_LENGTH = 6000
+MAX_FIELDS = 25
+MAX_EMBEDS = 10
+MAX_TITLE_LENGTH = 256
+MAX_DESCRIPTION_LENGTH = 4096
+MAX_FIELD_NAME_LENGTH = 256
+MAX_FIELD_VALUE_LENGTH = 1024
+MAX_FOOTER_LENGTH = 2048
+MAX_AUTHOR_LENGTH = 256
+
+
+def _text_length(name: str, value: Any) -> int:
+    """
+    How many characters `value`, the embed attribute `name`, counts towards the embed's total. Raises if it's over that attribute's own limit.
+    """
+    if name == "fields":
+        return sum(_field_length(field) for field in value or [])
+
+    if name == "footer":
+        text, limit = (value or {}).get("text"), MAX_FOOTER_LENGTH
+    elif name == "author":
+        text, limit = (value or {}).get("name"), MAX_AUTHOR_LENGTH
+    elif name == "title":
+        text, limit = value, MAX_TITLE_LENGTH
+    else:
+        text, limit = value, MAX_DESCRIPTION_LENGTH
+
+    length = len(text) if text else 0
+    if length > limit:
+        raise EmbedLimitExceeded(f"An embed's {name} can't be more than {limit} characters, this one is {length}.")
+    return length
+
+
+def _field_length(field: dict) -> int:
+    name, value = str(field.get("name") or ""), str(field.get("value") or "")
+    if len(name) > MAX_FIELD_NAME_LENGTH:
+        raise EmbedLimitExceeded(f"A field's name can't be more than {MAX_FIELD_NAME_LENGTH} characters, this one is {len(name)}.")
+    if len(value) > MAX_FIELD_VALUE_LENGTH:
+        raise EmbedLimitExceeded(f"A field's value can't be more than {MAX_FIELD_VALUE_LENGTH} characters, this one is {len(value)}.")
+    return len(name) + len(value)
+
+
+class Embed(Serializable):  # Always wanted to make this class :D
+    """
+    Keeps count of its characters and fields as it's changed, so going over Discord's limits fails right away instead of when the message is sent.
+
+    The title, description, fields, footer and author each have their own limit, which is always enforced. With `strict` (the default), a change that would take the embed over 6000 characters in total or 25 fields raises :class:`EmbedLimitExceeded` and leaves the embed as it was. Without it the embed can grow past those, and :meth:`split` divides it into embeds that fit.
+
+    Attributes:
+    -----------
+    strict: bool Whether the total length and field count are enforced.
+
+    Methods:
+    --------
+    :meth:`split()` - This embed divided into embeds that are each within the limits.
+    :meth:`exceeds_limits()` - Whether the embed is over the total length or field count.
+    """
+    __slots__ = ("type", "title", "description", "url", "video", "timestamp", "color", "footer", "image", "thumbnail", "provider", "author", "fields", "strict", "_length")
+
+    # Everything else (urls, images...) doesn't count towards the total.
+    _COUNTED = frozenset(("title", "description", "fields", "footer", "author"))
+
+    def __setattr__(self, name: str, value: Any):
+        if name in self._COUNTED:
+            # Checked before it's set, so a change that's rejected doesn't leave the embed over a limit.
+            length = self._length - _text_length(name, getattr(self, name, None)) + _text_length(name, value)
+            if name == "fields":
+                self._check(length, len(value or []))
+            else:
+                self._check(length, len(getattr(self, "fields", None) or []))
+            object.__setattr__(self, "_length", length)
+        super().__setattr__(name, value)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _check(self, length: int, fields: int):
+        if not self.strict:
+            return
+        if length > MAX_EMBED_LENGTH:
+            raise EmbedLimitExceeded(f"An embed can't be more than {MAX_EMBED_LENGTH} characters in total, this change would make it {length}.")
+        if fields > MAX_FIELDS:
+            raise EmbedLimitExceeded(f"An embed can't have more than {MAX_FIELDS} fields.")
+
+    def exceeds_limits(self) -> bool:
+        return self._length > MAX_EMBED_LENGTH or len(self.fields or []) > MAX_FIELDS
+
     def __init__(self, *,
         title: Optional[str] = None,
         description: Optional[str] = None,
         color: Optional[Colour] = None,
         video: Optional[dict] = None,
-        timestamp: Optional[datetime.datetime] = None,
+        timestamp: Optional[datetime] = None,
         colour: Optional[Colour] = None,
         url: Optional[str] = None,
         type: Optional[int] = None,
@@ -151,7 +240,10 @@ class Embed:  # Always wanted to make this class :D
         provider: Optional[dict] = None,
         author: Optional[dict] = None,
         fields: Optional[List[dict]] = None,
+        strict: bool = True,
                  ):
+        object.__setattr__(self, "_length", 0)
+        self.strict: bool = strict
         self.type: int = type
         self.title: Optional[str] = title
         self.type: Optional[str] = type
@@ -168,7 +260,14 @@ class Embed:  # Always wanted to make this class :D
         self.fields: Optional[List[str]] = fields
 
     def add_field(self, *, name: str, value: str, inline: bool = False):
-        self.fields.append({"name": name, "value": value, "inline": inline})
+        if self.fields is None:
+            self.fields = []
+        field = {"name": name, "value": value, "inline": inline}
+        length = self._length + _field_length(field)
+        self._check(length, len(self.fields) + 1)
+        self.fields.append(field)
+        object.__setattr__(self, "_length", length)
+        self.invalidate()
 
     def set_thumbnail(self, *, url: Optional[str] = None, proxy_url: Optional[str] = None, height: Optional[int] = None, width: Optional[int] = None):
         config = {
@@ -246,7 +345,7 @@ class Embed:  # Always wanted to make this class :D
     def set_color(self, *, colour: Colour):
         self.color = colour.value
 
-    def set_timestamp(self, *, timestamp: datetime.datetime):
+    def set_timestamp(self, *, timestamp: datetime):
         self.timestamp = timestamp.isoformat()
 
     def set_title(self, title: Optional[str] = None):
@@ -258,7 +357,7 @@ class Embed:  # Always wanted to make this class :D
     def set_url(self, url: Optional[str] = None):
         self.url = url
 
-    def to_dict(self):
+    def _to_dict(self):
         final_product = {}
 
         if getattr(self, "title"):
@@ -268,9 +367,9 @@ class Embed:  # Always wanted to make this class :D
         if getattr(self, "url"):
             final_product["url"] = self.url
         if getattr(self, "timestamp"):
-            final_product["timestamp"] = self.timestamp
+            final_product["timestamp"] = self.timestamp.isoformat() if isinstance(self.timestamp, datetime) else self.timestamp
         if getattr(self, "color"):
-            final_product["color"] = self.color
+            final_product["color"] = int(self.color)
         if getattr(self, "footer"):
             final_product["footer"] = self.footer
         if getattr(self, "image"):
@@ -287,3 +386,43 @@ class Embed:  # Always wanted to make this class :D
             final_product["fields"] = self.fields
 
         return final_product
+
+    def split(self) -> List["Embed"]:
+        """
+        The title, description, author, url and thumbnail stay on the first embed, the footer, timestamp and image go on the last, and the fields are spread over as many as it takes. Every embed keeps the colour.
+        """
+        if not self.exceeds_limits():
+            return [self]
+
+        first = Embed(title = self.title, description = self.description, url = self.url, color = self.color, author = self.author, thumbnail = self.thumbnail, fields = [])
+        embeds = [first]
+        for field in self.fields or []:
+            current = embeds[-1]
+            if len(current.fields) >= MAX_FIELDS or len(current) + _field_length(field) > MAX_EMBED_LENGTH:
+                current = Embed(color = self.color, fields = [])
+                embeds.append(current)
+            current.add_field(name = field.get("name"), value = field.get("value"), inline = field.get("inline", False))
+
+        last = embeds[-1]
+        if self.footer and len(last) + _text_length("footer", self.footer) > MAX_EMBED_LENGTH:
+            last = Embed(color = self.color)
+            embeds.append(last)
+        last.footer = self.footer
+        last.timestamp = self.timestamp
+        last.image = self.image
+        return embeds
+
+
+def group_embeds(embeds: List[Embed]) -> List[List[Embed]]:
+    """
+    Groups `embeds` into messages, each with at most 10 embeds and 6000 characters across all of them, Discord's limits for a single message. Embeds over the limits by themselves are split first.
+    """
+    messages: List[List[Embed]] = []
+    length = 0
+    for embed in (part for embed in embeds for part in embed.split()):
+        if not messages or len(messages[-1]) >= MAX_EMBEDS or length + len(embed) > MAX_EMBED_LENGTH:
+            messages.append([])
+            length = 0
+        messages[-1].append(embed)
+        length += len(embed)
+    return messages
@@ -46,8 +46,32 @@ class ThreadArchived(EpikCordException):
     """
     ...
 
-class NotFound404(EpikCordException):
+class HTTPException(EpikCordException):
+    """
+    An exception that is thrown when Discord answers a request with an error status
+    """
+    ...
+
+class NotFound404(HTTPException):
     """
     An exception that is thrown when a resource is not found
     """
-    ...
\ No newline at end of file
+    ...
+
+class CircuitOpen(EpikCordException):
+    """
+    An exception that is thrown when a request isn't made because its route has been failing and its circuit breaker is open
+    """
+    ...
+
+class InvalidTemplate(EpikCordException):
+    """
+    An exception that is thrown when a response template would be rejected by Discord, or declares a slot its text doesn't use
+    """
+    ...
+
+class EmbedLimitExceeded(EpikCordException):
+    """
+    An exception that is thrown when a change would take an embed over one of Discord's limits
+    """
+    ...
@@ -1,3 +1,13 @@
+import io
+import os
+import mmap
+import mimetypes
+from asyncio import get_running_loop
+from threading import Lock
+from aiohttp import MultipartWriter
+from aiohttp.payload import Payload
+from typing import Union, Optional, Iterator, List
+
 class File:
     """
     Represents a file. Sourced from Discord.py
@@ -30,12 +40,104 @@ class File:
         if spoiler and self.filename is not None and not self.filename.startswith('SPOILER_'):
             self.filename = 'SPOILER_' + self.filename
 
-            self.spoiler = spoiler or (self.filename is not None and self.filename.startswith('SPOILER_'))
+        self.spoiler = spoiler or (self.filename is not None and self.filename.startswith('SPOILER_'))
+
+    @property
+    def size(self) -> int:
+        position = self.fp.tell()
+        end = self.fp.seek(0, io.SEEK_END)
+        self.fp.seek(position)
+        return end - self._original_pos
+
+    @property
+    def content_type(self) -> str:
+        return mimetypes.guess_type(self.filename or "")[0] or "application/octet-stream"
+
+    def to_dict(self, id: int) -> dict:
+        """
+        The entry for this file in a message's `attachments`, `id` is its index in the files being uploaded.
+        """
+        return {"id": id, "filename": self.filename}
+
+    def chunks(self, chunk_size: int = 1 << 16) -> Iterator[bytes]:
+        """
+        Yields the file's contents from the start, `chunk_size` bytes at a time. Files on disk are memory-mapped instead of read through a buffer.
+        """
+        self.reset()
+        try:
+            mapped = mmap.mmap(self.fp.fileno(), 0, access = mmap.ACCESS_READ)
+        except (OSError, ValueError, io.UnsupportedOperation):
+            # In-memory buffers, pipes and empty files can't be mapped.
+            mapped = None
+
+        if mapped is None:
+            while chunk := self.fp.read(chunk_size):
+                yield chunk
+            return
+
+        with mapped:
+            for start in range(self._original_pos, len(mapped), chunk_size):
+                yield mapped[start:start + chunk_size]
+
+    def reset(self, *, seek: Union[int, bool] = True) -> None:
+        if seek:
+            self.fp.seek(self._original_pos)
+
+    def close(self) -> None:
+        self.fp.close = self._closer
+        self._closer()
+
+class FilePayload(Payload):
+    """
+    Streams a :class:`File` into a request body a chunk at a time, so it's never all in memory. Every write starts from the beginning of the file, so the same File can be sent again when a request is retried.
+    """
+    # Tells aiohttp the payload holds nothing it needs to close: write releases what it opens itself, and the File belongs to whoever made it.
+    _autoclose = True
+
+    def __init__(self, file: File, **kwargs):
+        super().__init__(file, filename = file.filename, content_type = file.content_type, **kwargs)
+        self._size = file.size
+
+    async def write(self, writer):
+        loop = get_running_loop()
+        chunks = self._value.chunks()
+        # A read can still be running in the executor after the write is cancelled, the lock keeps it from racing the close below.
+        lock = Lock()
+
+        def read() -> Optional[bytes]:
+            with lock:
+                return next(chunks, None)
 
-        def reset(self, *, seek: Union[int, bool] = True) -> None:
-            if seek:
-                self.fp.seek(self._original_pos)
+        def close():
+            with lock:
+                chunks.close()
 
-        def close(self) -> None:
-            self.fp.close = self._closer
-            self._closer()
+        try:
+            # Reading from disk (or faulting in mapped pages) blocks, so it's done off the event loop.
+            while chunk := await loop.run_in_executor(None, read):
+                await writer.write(chunk)
+        finally:
+            # Closing the generator unmaps the file if the write was aborted partway, rather than whenever it's collected. If a read is still running it's closed once that's done.
+            if lock.acquire(blocking = False):
+                try:
+                    chunks.close()
+                finally:
+                    lock.release()
+            else:
+                loop.run_in_executor(None, close)
+
+    def decode(self, encoding: str = "utf-8", errors: str = "strict") -> str:
+        return b"".join(self._value.chunks()).decode(encoding, errors)
+
+def multipart_body(payload_json: Optional[bytes], files: List[File]) -> MultipartWriter:
+    """
+    Builds the multipart/form-data body for a message with attachments. The files are streamed when the request is sent, a body can only be sent once so build a new one for every attempt.
+    """
+    body = MultipartWriter("form-data")
+    if payload_json is not None:
+        part = body.append(payload_json, {"Content-Type": "application/json"})
+        part.set_content_disposition("form-data", name = "payload_json")
+    for index, file in enumerate(files):
+        part = body.append_payload(FilePayload(file))
+        part.set_content_disposition("form-data", name = f"files[{index}]", filename = file.filename)
+    return body
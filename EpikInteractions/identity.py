@@ -0,0 +1,67 @@
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, Optional
+from .cache import EntityCache
+from .snowflake import Snowflake
+
+current_identity_map: ContextVar[Optional["IdentityMap"]] = ContextVar("current_identity_map", default = None)
+
+
+class IdentityMap:
+    """
+    Makes sure a user or member that appears several times while handling one request (as the invoker, in resolved data, as a message's author and in its mentions...) is only built once, every later appearance gets the same object.
+
+    :meth:`Interface.handle` starts a new one for every request, callbacks and anything they fetch share it. Only users and members are mapped, they're what repeats, and mapping every message a long callback fetches would keep them all alive until it finishes.
+
+    Attributes:
+    -----------
+    cache: Optional[EntityCache] If passed, objects are shared between requests too: an object that's already in the cache is refreshed with the fields just built from this request's payload and used in its place. Nothing is ever taken from the cache as it is, so it's never out of date.
+    guild_id: Optional[str] The guild the request came from, members are looked up in `cache` with it.
+    hits: int How many objects were reused instead of built.
+    """
+    def __init__(self, *, cache: Optional[EntityCache] = None, guild_id: Optional[str] = None):
+        self.cache: Optional[EntityCache] = cache
+        self.guild_id: Optional[str] = guild_id
+        self.hits: int = 0
+        self._objects: Dict[tuple, Any] = {}
+
+    def get(self, kind: str, id: Hashable, build: Callable[[], Any]) -> Any:
+        # The same id can come in as a string from a payload or as a Snowflake from a model.
+        key = (kind, Snowflake(id))
+        obj = self._objects.get(key)
+        if obj is not None:
+            self.hits += 1
+            return obj
+
+        if self.cache:
+            if kind == "users":
+                obj = self.cache.get_user(id)
+            elif kind == "members" and self.guild_id:
+                obj = self.cache.get_member(self.guild_id, id)
+
+        fresh = build()
+        if obj is not None and type(obj) is type(fresh):
+            _refresh(obj, fresh)
+        else:
+            obj = fresh
+        self._objects[key] = obj
+        return obj
+
+
+def _refresh(obj: Any, fresh: Any):
+    """
+    Copies every slot of `fresh` onto `obj`, so an object other code already holds picks up the latest payload.
+    """
+    for cls in type(fresh).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            if hasattr(fresh, name):
+                object.__setattr__(obj, name, getattr(fresh, name))
+
+
+def identity(kind: str, id: Optional[Hashable], build: Callable[[], Any]) -> Any:
+    """
+    Returns the object for `id` from the current request's :class:`IdentityMap`, calling `build` to make it if it's not there. Outside of a request it just calls `build`.
+    """
+    identity_map = current_identity_map.get()
+    if identity_map is None or id is None:
+        return build()
+    return identity_map.get(kind, id, build)
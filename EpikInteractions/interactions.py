@@ -2,27 +2,154 @@ from .role import Role
 from .attachment import Attachment
 from .message import Message
 from .channels import channel_from_type
-from quart import jsonify
+from asyncio import Event, Future, TimeoutError, get_running_loop, wait_for
+from functools import cached_property
+from typing import Optional, List
 from .user import User
 from .member import GuildMember
+from .file import File
+from .cache import cache_of
+from .identity import identity
+from .snowflake import Snowflake, snowflake
+from .registry import TypeRegistry
+from .scheduler import Priority
+from .serialization import serialize
+
+# How long webhook calls wait for the initial response to be written before going ahead anyway, Discord drops the interaction after 3 seconds without one.
+RESPONSE_SENT_TIMEOUT = 3.0
+
+def message_payload(content: Optional[str] = None, *, embeds: Optional[list] = None, components: Optional[list] = None, tts: Optional[bool] = False, allowed_mentions = None, ephemeral: Optional[bool] = False, files: Optional[List[File]] = None) -> dict:
+    payload = {}
+
+    if content:
+        payload["content"] = content
+
+    if embeds:
+        payload["embeds"] = [serialize(embed) for embed in embeds]
+
+    if components:
+        payload["components"] = [serialize(component) for component in components]
+
+    if tts:
+        payload["tts"] = tts
+
+    if allowed_mentions:
+        payload["allowed_mentions"] = allowed_mentions.to_dict()
+
+    if ephemeral:
+        payload["flags"] = 1 << 6
+
+    if files:
+        payload["attachments"] = [file.to_dict(index) for index, file in enumerate(files)]
+
+    return payload
 
 class BaseInteraction:
-    def __init__(self, http, data: dict, headers: dict):
+    """
+    The base for every interaction Discord sends to the endpoint.
+
+    Only the scalar fields are read up front. `member`, `user` and `message` are built from `raw_data` the first time they're accessed, so a callback only pays for what it uses.
+
+    The first :meth:`reply` or :meth:`defer` isn't sent to Discord, it's handed back to :meth:`Interface.process_commands` and returned as the body of the webhook response. Anything after that goes through the HTTPClient as a follow-up. Until the endpoint has written that response Discord doesn't know the interaction was answered, so follow-ups and edits wait for `response_sent` first.
+    """
+    def __init__(self, client, data: dict, headers: dict):
+        self.client = client
         self.raw_data: dict = data
-        self.id: int = data["id"]
+        self.id: Snowflake = Snowflake(data["id"])
         self.headers: dict = headers
-        self.application_id: str = data["application_id"]
+        self.application_id: Snowflake = Snowflake(data["application_id"])
         self.type: int = data["type"]
         self.interaction_data: dict | None = data.get("interaction_data")
-        self.guild_id: str | None = data.get("guild_id")
-        self.channel_id: str | None = data.get("channel_id")
-        self.member: GuildMember | None = GuildMember(http, data.get("member"))
-        self.user: User | None = User(http, data.get("user")) if data.get("user") else None
+        self.guild_id: Snowflake | None = snowflake(data.get("guild_id"))
+        self.channel_id: Snowflake | None = snowflake(data.get("channel_id"))
         self.token: str = data["token"]
         self.version: int = data["version"]
-        self.message: Message | None = Message(http, data.get("message")) if data.get("message") else None
         self.locale: str | None = data.get("locale")
         self.guild_locale: str | None = data.get("guild_locale")
+        self.response: Future = get_running_loop().create_future()
+        # Set by the endpoint once the initial response has been written, see Interface.handle.
+        self.response_sent: Event = Event()
+        self.auto_deferred: bool = False
+        self._edited_deferred: bool = False
+
+    @cached_property
+    def member(self) -> GuildMember | None:
+        if not self.raw_data.get("member"):
+            return None
+        member = identity("members", self.raw_data["member"]["user"]["id"], lambda: GuildMember(self.client, self.raw_data["member"]))
+        cache = cache_of(self.client)
+        return cache.add_member(self.guild_id, member) if cache else member
+
+    @cached_property
+    def user(self) -> User | None:
+        if not self.raw_data.get("user"):
+            return None
+        user = identity("users", self.raw_data["user"]["id"], lambda: User(self.client, self.raw_data["user"]))
+        cache = cache_of(self.client)
+        return cache.add_user(user) if cache else user
+
+    @cached_property
+    def message(self) -> Message | None:
+        if not self.raw_data.get("message"):
+            return None
+        message = Message(self.client, self.raw_data["message"])
+        cache = cache_of(self.client)
+        return cache.add_message(message) if cache else message
+
+    @property
+    def responded(self) -> bool:
+        return self.response.done()
+
+    def respond(self, payload: dict) -> bool:
+        """
+        Hands `payload` back to the endpoint as the initial response. Returns False if the interaction has already been responded to.
+        """
+        if self.responded:
+            return False
+        self.response.set_result(payload)
+        return True
+
+    async def reply(self, content: Optional[str] = None, *, embeds: Optional[list] = None, components: Optional[list] = None, tts: Optional[bool] = False, allowed_mentions = None, ephemeral: Optional[bool] = False):
+        payload = message_payload(content, embeds = embeds, components = components, tts = tts, allowed_mentions = allowed_mentions, ephemeral = ephemeral)
+        if self.respond({"type": 4, "data": payload}):
+            return
+        if self.auto_deferred and not self._edited_deferred:
+            # The library deferred for us, so the first reply fills in that "thinking..." message.
+            self._edited_deferred = True
+            return await self.edit_original_response(content, embeds = embeds, components = components, allowed_mentions = allowed_mentions)
+        return await self.followup(content, embeds = embeds, components = components, tts = tts, allowed_mentions = allowed_mentions, ephemeral = ephemeral)
+
+    async def defer(self, *, ephemeral: Optional[bool] = False):
+        self.respond({"type": 5, "data": {"flags": 1 << 6} if ephemeral else {}})
+
+    async def _wait_until_sent(self):
+        if self.response_sent.is_set():
+            return
+        try:
+            await wait_for(self.response_sent.wait(), RESPONSE_SENT_TIMEOUT)
+        except TimeoutError:
+            pass
+
+    async def followup(self, content: Optional[str] = None, *, embeds: Optional[list] = None, components: Optional[list] = None, tts: Optional[bool] = False, allowed_mentions = None, ephemeral: Optional[bool] = False, files: Optional[List[File]] = None) -> Message:
+        payload = message_payload(content, embeds = embeds, components = components, tts = tts, allowed_mentions = allowed_mentions, ephemeral = ephemeral, files = files)
+        await self._wait_until_sent()
+        response = await self.client.http.post(f"/webhooks/{self.application_id}/{self.token}", json = payload, files = files, priority = Priority.INTERACTION)
+        return Message(self.client, await response.json())
+
+    async def fetch_original_response(self) -> Message:
+        await self._wait_until_sent()
+        response = await self.client.http.get(f"/webhooks/{self.application_id}/{self.token}/messages/@original", priority = Priority.INTERACTION)
+        return Message(self.client, await response.json())
+
+    async def edit_original_response(self, content: Optional[str] = None, *, embeds: Optional[list] = None, components: Optional[list] = None, allowed_mentions = None, files: Optional[List[File]] = None) -> Message:
+        payload = message_payload(content, embeds = embeds, components = components, allowed_mentions = allowed_mentions, files = files)
+        await self._wait_until_sent()
+        response = await self.client.http.patch(f"/webhooks/{self.application_id}/{self.token}/messages/@original", json = payload, files = files, priority = Priority.INTERACTION)
+        return Message(self.client, await response.json())
+
+    async def delete_original_response(self):
+        await self._wait_until_sent()
+        await self.client.http.delete(f"/webhooks/{self.application_id}/{self.token}/messages/@original", priority = Priority.INTERACTION)
 
     def is_ping(self):
         return self.type == 1
@@ -41,28 +168,145 @@ class BaseInteraction:
 
 class PingInteraction(BaseInteraction):
     async def reply(self):
-        return jsonify({
+        self.respond({
             "type": 1
         })
 
 class ResolvedDataManager:
-    def __init__(self, http, data: dict):
-        self.data: dict
-        self.http = http
-        self.users: list[User] | None = [User(http, user) for user in data.get("users", [])] if data.get("users") else None
-        self.members: list[GuildMember] | None = [GuildMember(http, member) for member in data.get("members", [])] if data.get("members") else None
-        self.roles: list[Role] | None = [Role(http, role) for role in data.get("roles", [])] if data.get("roles") else None
-        self.channels = [channel_from_type(http, channel) for channel in data.get("channels", [])] if data.get("channels") else None
-        self.messages: list[Message] | None = [Message(http, message) for message in data.get("messages", [])] if data.get("messages") else None
-        self.attachments: list[Attachment] | None = [Attachment(attachment) for attachment in data.get("attachments", [])] if data.get("attachments") else None
+    """
+    The users, members, roles, channels, messages and attachments referenced by an interaction's options.
+
+    Nothing is parsed until it's asked for. The `get_*` methods build just the one object (and remember it), the list attributes build everything of that kind. Users, members and messages are added to the client's cache as they're built, channels aren't since Discord only sends part of them here.
+    """
+    def __init__(self, client, data: dict, guild_id: Optional[str] = None):
+        self.data: dict = data
+        self.client = client
+        self.guild_id: Optional[str] = guild_id
+        self._parsed: dict = {}
+
+    def _get(self, kind: str, id: str, parser: callable, add: Optional[callable] = None):
+        # The payload is keyed by strings, ids may come in as Snowflakes.
+        id = str(id)
+        key = (kind, id)
+        if key not in self._parsed:
+            raw = self.data.get(kind, {}).get(id)
+            parsed = parser(raw) if raw is not None else None
+            if parsed is not None and add:
+                add(parsed)
+            self._parsed[key] = parsed
+        return self._parsed[key]
+
+    def get_user(self, id: str) -> User | None:
+        cache = cache_of(self.client)
+        return self._get("users", id, lambda user: identity("users", id, lambda: User(self.client, user)), cache and cache.add_user)
+
+    def get_member(self, id: str) -> GuildMember | None:
+        cache = cache_of(self.client)
+        add = (lambda member: cache.add_member(self.guild_id, member)) if cache and self.guild_id else None
+        # Resolved members don't include their user, it's under "users" with the same id.
+        return self._get("members", id, lambda member: identity("members", id, lambda: GuildMember(self.client, {**member, "user": self.data.get("users", {}).get(id)})), add)
+
+    def get_role(self, id: str) -> Role | None:
+        return self._get("roles", id, lambda role: Role(self.client, role))
+
+    def get_channel(self, id: str):
+        return self._get("channels", id, lambda channel: channel_from_type(self.client, channel))
+
+    def get_message(self, id: str) -> Message | None:
+        cache = cache_of(self.client)
+        return self._get("messages", id, lambda message: Message(self.client, message), cache and cache.add_message)
+
+    def get_attachment(self, id: str) -> Attachment | None:
+        return self._get("attachments", id, Attachment)
+
+    @cached_property
+    def users(self) -> list[User] | None:
+        return [self.get_user(id) for id in self.data["users"]] if self.data.get("users") else None
+
+    @cached_property
+    def members(self) -> list[GuildMember] | None:
+        return [self.get_member(id) for id in self.data["members"]] if self.data.get("members") else None
+
+    @cached_property
+    def roles(self) -> list[Role] | None:
+        return [self.get_role(id) for id in self.data["roles"]] if self.data.get("roles") else None
+
+    @cached_property
+    def channels(self) -> list | None:
+        return [self.get_channel(id) for id in self.data["channels"]] if self.data.get("channels") else None
+
+    @cached_property
+    def messages(self) -> list[Message] | None:
+        return [self.get_message(id) for id in self.data["messages"]] if self.data.get("messages") else None
+
+    @cached_property
+    def attachments(self) -> list[Attachment] | None:
+        return [self.get_attachment(id) for id in self.data["attachments"]] if self.data.get("attachments") else None
 
 class ApplicationCommandInteraction(BaseInteraction):
-    def __init__(self, http, data: dict, headers: dict):
-        super().__init__(http, data, headers)
-        self.command_name: str = self.data["command_name"]
-        self.command_id: str = self.data["command_id"]
-        self.command_type: int = data["type"]
-        self.resolved: ResolvedDataManager = ResolvedDataManager(http, self.data.get("resolved"))
-        self._options: dict = self.data.get("options")
-    
-    async def reply()
\ No newline at end of file
+    def __init__(self, client, data: dict, headers: dict):
+        super().__init__(client, data, headers)
+        self.data: dict = data.get("data", {})
+        self.command_name: str = self.data["name"]
+        self.command_id: Snowflake = Snowflake(self.data["id"])
+        self.command_type: int = self.data.get("type", 1)
+        self.resolved: ResolvedDataManager = ResolvedDataManager(client, self.data.get("resolved", {}), self.guild_id)
+        self.target_id: Snowflake | None = snowflake(self.data.get("target_id"))
+        self._options: list = self.data.get("options", [])
+
+        # Subcommands and groups come through as a single nested option, so the path is at most two deep.
+        path = []
+        while self._options and self._options[0]["type"] in (1, 2):
+            path.append(self._options[0]["name"])
+            self._options = self._options[0].get("options", [])
+        self.command_path: tuple = tuple(path)
+
+    def get_option(self, name: str, default = None):
+        """
+        Returns the raw value of an option, for user, channel, role and attachment options that's an id you can look up with :attr:`resolved`.
+        """
+        for option in self._options:
+            if option["name"] == name:
+                return option.get("value", default)
+        return default
+
+class MessageComponentInteraction(BaseInteraction):
+    def __init__(self, client, data: dict, headers: dict):
+        super().__init__(client, data, headers)
+        self.data: dict = data.get("data", {})
+        self.custom_id: str = self.data.get("custom_id")
+        self.component_type: int = self.data.get("component_type")
+        self.values: List[str] = self.data.get("values", [])
+
+    async def defer(self, *, ephemeral: Optional[bool] = False):
+        # Components acknowledge with a deferred update, the message they're on is edited later.
+        self.respond({"type": 6})
+
+    async def update(self, content: Optional[str] = None, *, embeds: Optional[list] = None, components: Optional[list] = None, allowed_mentions = None):
+        payload = message_payload(content, embeds = embeds, components = components, allowed_mentions = allowed_mentions)
+        if not self.respond({"type": 7, "data": payload}):
+            return await self.edit_original_response(content, embeds = embeds, components = components, allowed_mentions = allowed_mentions)
+
+class AutoCompleteInteraction(ApplicationCommandInteraction):
+    async def defer(self, *, ephemeral: Optional[bool] = False):
+        # Autocomplete can't be deferred, an automatic deferral answers with no choices instead.
+        self.respond({"type": 8, "data": {"choices": []}})
+
+    async def send_choices(self, choices: list):
+        self.respond({"type": 8, "data": {"choices": [choice.to_dict() if hasattr(choice, "to_dict") else choice for choice in choices]}})
+
+class ModalSubmitInteraction(BaseInteraction):
+    def __init__(self, client, data: dict, headers: dict):
+        super().__init__(client, data, headers)
+        self.data: dict = data.get("data", {})
+        self.custom_id: str = self.data.get("custom_id")
+        self.components: list = self.data.get("components", [])
+
+
+# Unknown interaction types still get the fields every interaction has.
+interaction_registry = TypeRegistry("interaction", fallback = BaseInteraction)
+interaction_registry.register(1, PingInteraction)
+interaction_registry.register(2, ApplicationCommandInteraction)
+interaction_registry.register(3, MessageComponentInteraction)
+interaction_registry.register(4, AutoCompleteInteraction)
+interaction_registry.register(5, ModalSubmitInteraction)
@@ -1,60 +1,269 @@
 from nacl.signing import VerifyKey
 from nacl.exceptions import BadSignatureError
 from .interactions import *
-from aiohttp import ClientSession
-from quart import request, Response
+from aiohttp import ClientSession, ClientResponse, ClientConnectionError, TCPConnector
+from asyncio import get_running_loop, wait, gather, shield, sleep, Event, FIRST_COMPLETED, Task, TimeoutError
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+from collections import Counter
+from .codec import DecodeError, dumps, loads
+from .ratelimit import BaseRateLimiter, RateLimiter, split_route
+from .retry import RetryPolicy, CircuitBreaker
+from .scheduler import Priority, PriorityScheduler
+from logging import getLogger
+from .adapters import process_quart, process_starlette
 from typing import (
     Union,
     List,
-    Optional
+    Optional,
+    Dict,
+    Tuple,
+    Set
 )
-from .commands import SlashCommand, UserCommand, MessageCommand, AnyOption        
-
-def interaction_from_type(data: dict):
-    if data["type"] == 1:
-        return PingInteraction(data)
-    elif data["type"] == 2:
-        return ApplicationCommandInteraction(data)
-    elif data["type"] == 3:
-        return MessageComponentInteraction(data)
-    elif data["type"] == 4:
-        return AutoCompleteInteraction(data)
-    elif data["type"] == 5:
-        return ModalSubmitInteraction(data)
+from .file import File, multipart_body
+from .cache import EntityCache
+from .identity import IdentityMap, current_identity_map
+from .exceptions import NotFound404
+from .commands import MISSING, SlashCommand, UserCommand, MessageCommand, AnyOption        
+from .templates import ResponseTemplate
+
+logger = getLogger(__name__)
+
+def interaction_from_type(client, data: dict, headers: dict) -> BaseInteraction:
+    return interaction_registry.get(data["type"])(client, data, headers)
+
+class JSONResponse(ClientResponse):
+    """
+    The response class HTTPClient's session uses, so `await response.json()` goes through the codec.
+
+    The body is only parsed once, every call to `json()` returns the same object. Coalesced GETs share the response between every caller, so the result must be treated as read only: copy it before changing it.
+    """
+    _json = None
+
+    async def json(self, *, loads = loads, **kwargs):
+        # Cached, coalesced GETs share one response between every caller.
+        if self._json is None:
+            body = await self.read()
+            self._json = loads(body) if body else None
+        return self._json
 
 class HTTPClient:
-    def __init__(self, *args, **kwargs):
-        self.session = ClientSession(*args, **kwargs)
+    """
+    Makes requests to Discord's API.
+
+    The session is created on the first request (or by :meth:`start`), inside the running event loop. Its connector keeps up to `connection_limit` connections (`connections_per_host` to a single host) alive for `keepalive_timeout` seconds and caches DNS lookups for `dns_cache_ttl` seconds, pass `connector` to use your own instead.
+
+    Every request waits for its rate limit bucket (and the global limit) before it's sent, so the limits are respected rather than discovered. If Discord still answers with a 429 the request is retried after the delay it gives, up to `max_ratelimit_retries` times.
+
+    Pass `files`, a list of :class:`File`, to upload attachments. They're streamed from disk as multipart/form-data, with `json` sent as its `payload_json`, and rewound whenever the request is retried.
+
+    Attributes:
+    -----------
+    session: ClientSession The aiohttp session requests are made with.
+    warm_connections: int How many connections to Discord :meth:`start` opens ahead of time, so the first requests after a deploy don't pay for the TCP and TLS handshakes.
+    ratelimiter: BaseRateLimiter The rate limit state for this client. Pass a :class:`SharedRateLimiter` to share it between processes.
+    max_ratelimit_retries: int How many times a request is retried after a 429.
+    retry_policy: RetryPolicy When requests that fail with a 5xx, a dropped connection or a timeout are retried.
+    breakers: Dict[str, CircuitBreaker] The circuit breaker for each route (and for each webhook, by its id), created with `breaker_threshold` and `breaker_recovery`. A request that still fails after its retries counts as one failure, routes that keep failing raise :class:`CircuitOpen` instead of being requested.
+    retries: Counter How many times requests to each route have been retried.
+    coalesce: bool Whether identical GET requests made while one is already in flight wait for that one instead of making their own. They all get the same response, and its `.json()` is only parsed once and shared, so callers mustn't change what it returns.
+    scheduler: PriorityScheduler Limits requests in flight to `max_concurrency`. When they're all taken, requests with a more urgent :class:`Priority` go first. Interaction callbacks and requests to the application's own webhook (interaction follow-ups and edits) default to `Priority.INTERACTION`, everything else, other webhooks included, to `Priority.DEFAULT`. Pass `priority` to override it.
+    application_id: Optional[str] The application's id, which its interaction webhooks are under. The Interface fills it in from the first interaction it gets.
+
+    Methods:
+    --------
+    `async`:meth:`start()` - Creates the session and warms up `warm_connections` connections. Optional, the session is created on the first request otherwise.
+
+    `async`:meth:`close()` - Closes the session and the rate limiter.
+    """
+    def __init__(self, *args, ratelimiter: Optional[BaseRateLimiter] = None, max_ratelimit_retries: int = 5, retry_policy: Optional[RetryPolicy] = None, breaker_threshold: int = 5, breaker_recovery: float = 30.0, coalesce: bool = True, max_concurrency: int = 50, priority_aging: float = 2.0, connection_limit: int = 100, connections_per_host: int = 50, keepalive_timeout: float = 30.0, dns_cache_ttl: Optional[int] = 300, warm_connections: int = 0, **kwargs):
+        kwargs.setdefault("response_class", JSONResponse)
+        self._session_args: tuple = args
+        self._session_kwargs: dict = kwargs
+        self._session: Optional[ClientSession] = None
+        self.connection_limit: int = connection_limit
+        self.connections_per_host: int = connections_per_host
+        self.keepalive_timeout: float = keepalive_timeout
+        self.dns_cache_ttl: Optional[int] = dns_cache_ttl
+        self.warm_connections: int = warm_connections
         self.base_uri = "https://discord.com/api/v9"
-        
+        self.ratelimiter: BaseRateLimiter = ratelimiter or RateLimiter()
+        self.max_ratelimit_retries: int = max_ratelimit_retries
+        self.retry_policy: RetryPolicy = retry_policy or RetryPolicy()
+        self.breaker_threshold: int = breaker_threshold
+        self.breaker_recovery: float = breaker_recovery
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.retries: Counter = Counter()
+        self.coalesce: bool = coalesce
+        self._in_flight: Dict[tuple, Task] = {}
+        self.scheduler: PriorityScheduler = PriorityScheduler(max_concurrency = max_concurrency, aging = priority_aging)
+        self.application_id: Optional[str] = None
 
-    async def get(self, url, *args, **kwargs):
+    @property
+    def session(self) -> ClientSession:
+        if self._session is None or self._session.closed:
+            kwargs = self._session_kwargs
+            if "connector" not in kwargs:
+                kwargs = {**kwargs, "connector": TCPConnector(limit = self.connection_limit, limit_per_host = self.connections_per_host, keepalive_timeout = self.keepalive_timeout, use_dns_cache = self.dns_cache_ttl is not None, ttl_dns_cache = self.dns_cache_ttl)}
+            self._session = ClientSession(*self._session_args, **kwargs)
+        return self._session
+
+    async def start(self):
+        session = self.session
+        if self.warm_connections:
+            results = await gather(*(self._warm_up(session) for _ in range(self.warm_connections)), return_exceptions = True)
+            failed = [result for result in results if isinstance(result, BaseException)]
+            if failed:
+                logger.warning(f"Couldn't warm up {len(failed)} of {self.warm_connections} connections: {failed[0]!r}")
+
+    async def _warm_up(self, session: ClientSession):
+        # /gateway needs no authorization and isn't rate limited per bot, it's only used to get a connection into the pool.
+        async with session.get(f"{self.base_uri}/gateway") as response:
+            await response.read()
+
+    def metrics(self) -> dict:
+        """
+        How many times each route has been retried, the state of each route's circuit breaker, and how many requests are waiting for the scheduler by priority.
+        """
+        return {
+            "retries": dict(self.retries),
+            "breakers": {route: breaker.state for route, breaker in self.breakers.items()},
+            "waiting": self.scheduler.waiting()
+        }
+
+    async def request(self, method: str, url: str, *args, priority: Optional[int] = None, **kwargs):
         if url.startswith("/"):
             url = url[1:]
-        return await self.session.get(f"{self.base_uri}/{url}", *args, **kwargs)
+        if priority is None:
+            priority = Priority.INTERACTION if self._is_interaction_url(url) else Priority.DEFAULT
+        kwargs["priority"] = priority
+
+        if method != "GET" or not self.coalesce or args or set(kwargs) - {"params", "priority"}:
+            return await self._request(method, url, *args, **kwargs)
+
+        params = kwargs.get("params") or {}
+        key = (url, tuple(sorted((name, str(value)) for name, value in params.items())))
+        task = self._in_flight.get(key)
+        if not task:
+            task = self._in_flight[key] = get_running_loop().create_task(self._coalesced_request(url, **kwargs))
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # Shielded so one caller being cancelled doesn't cancel the request for everyone else.
+        return await shield(task)
+
+    def _is_interaction_url(self, url: str) -> bool:
+        # Interaction tokens are used through the application's own webhook, any other webhook is ordinary traffic.
+        if url.startswith("interactions/"):
+            return True
+        return self.application_id is not None and url.startswith(f"webhooks/{self.application_id}/")
+
+    async def _coalesced_request(self, url: str, **kwargs):
+        response = await self._request("GET", url, **kwargs)
+        # Read now, so the callers sharing it aren't racing each other to read the body.
+        await response.read()
+        return response
+
+    async def _request(self, method: str, url: str, *args, priority: int = Priority.DEFAULT, **kwargs):
+        if "json" in kwargs:
+            kwargs["data"] = dumps(kwargs.pop("json"))
+            if not kwargs.get("files"):
+                kwargs["headers"] = {**(kwargs.get("headers") or {}), "Content-Type": "application/json"}
+
+        route, major = split_route(method, url)
+        if url.startswith("webhooks/"):
+            # Every webhook (and every application's interaction webhook) shares a route template, one failing mustn't open the circuit for the others.
+            route = f"{route} {major.split('/', 1)[0]}"
+        breaker = self.breakers.get(route)
+        if not breaker:
+            breaker = self.breakers[route] = CircuitBreaker(route, failure_threshold = self.breaker_threshold, recovery_time = self.breaker_recovery)
+
+        started_at = monotonic()
+        attempt = 0
+        while True:
+            breaker.check()
+            status = None
+            try:
+                response = await self._ratelimited_request(method, url, *args, priority = priority, **kwargs)
+            except (ClientConnectionError, TimeoutError):
+                # A half open breaker's probe isn't retried, its failure re-opens the breaker straight away.
+                delay = self.retry_policy.delay(attempt)
+                if breaker.state != "closed" or not self.retry_policy.should_retry(method, attempt, started_at, delay):
+                    # One failure per request, however many times it was retried.
+                    breaker.record_failure()
+                    raise
+            else:
+                if response.status < 500:
+                    breaker.record_success()
+                    return response
+                status = response.status
+                delay = self.retry_policy.delay(attempt)
+                if breaker.state != "closed" or not self.retry_policy.should_retry(method, attempt, started_at, delay, status):
+                    breaker.record_failure()
+                    return response
+                response.release()
+
+            attempt += 1
+            self.retries[route] += 1
+            logger.debug(f"Retrying {method} {url} in {delay:.2f}s ({f'status {status}' if status else 'connection failed'}, attempt {attempt}).")
+            await sleep(delay)
+
+    async def _ratelimited_request(self, method: str, url: str, *args, priority: int = Priority.DEFAULT, files: Optional[List[File]] = None, **kwargs):
+        payload_json = kwargs.pop("data", None) if files else None
+        for tries in range(self.max_ratelimit_retries + 1):
+            if files:
+                kwargs["data"] = multipart_body(payload_json, files)
+            await self.ratelimiter.acquire(method, url)
+            try:
+                # After the rate limit, so a request stuck behind its bucket isn't holding a slot.
+                await self.scheduler.acquire(priority)
+            except BaseException:
+                self.ratelimiter.cancel(method, url)
+                raise
+            try:
+                response = await self.session.request(method, f"{self.base_uri}/{url}", *args, **kwargs)
+            except BaseException:
+                self.ratelimiter.cancel(method, url)
+                raise
+            finally:
+                self.scheduler.release()
+
+            if response.status != 429 or tries == self.max_ratelimit_retries:
+                self.ratelimiter.update(method, url, response.headers)
+                return response
+
+            retry_after = float(response.headers.get("Retry-After", 1))
+            is_global = response.headers.get("X-RateLimit-Global") == "true"
+            try:
+                data = await response.json()
+                if isinstance(data, dict):
+                    retry_after = float(data.get("retry_after", retry_after))
+                    is_global = data.get("global", False) or is_global
+            except DecodeError:
+                # Cloudflare's bans are HTML pages, the headers are all there is to go on.
+                pass
+            finally:
+                # Even if reading the body failed or was cancelled, so the bucket isn't left taken.
+                self.ratelimiter.ratelimited(method, url, retry_after, is_global)
+
+    async def get(self, url, *args, **kwargs):
+        return await self.request("GET", url, *args, **kwargs)
 
     async def post(self, url, *args, **kwargs):
-        if url.startswith("/"):
-            url[1:]
-        return await self.session.post(f"{self.base_uri}/{url}", *args, **kwargs)
+        return await self.request("POST", url, *args, **kwargs)
     
     async def put(self, url, *args, **kwargs):
-        if url.startswith("/"):
-            url[1:]
-        return await self.session.put(f"{self.base_uri}/{url}", *args, **kwargs)
+        return await self.request("PUT", url, *args, **kwargs)
     
     async def delete(self, url, *args, **kwargs):
-        if url.startswith("/"):
-            url[1:]
-        return await self.session.delete(f"{self.base_uri}/{url}", *args, **kwargs)
+        return await self.request("DELETE", url, *args, **kwargs)
 
     async def patch(self, url, *args, **kwargs):
-        if url.startswith("/"):
-            url[1:]
-        return await self.session.patch(f"{self.base_uri}/{url}", *args, **kwargs)
+        return await self.request("PATCH", url, *args, **kwargs)
 
     async def close(self):
-        await self.session.close()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        await self.ratelimiter.close()
 
 class Interface:
     """
@@ -63,13 +272,47 @@ class Interface:
     Attributes:
     -----------
     key: str The public API key you got from the developer portal. This is safe to share according to Discord Developers server.
-    http: HTTPClient The HTTPClient object that is used to make requests.
+    verify_key: VerifyKey The parsed Ed25519 key used to verify incoming requests. Built once so requests don't pay for it.
+    verify_executor: Optional[ThreadPoolExecutor] The thread pool signatures are verified on, if `verify_in_thread` was passed. libsodium releases the GIL, so with spare CPU cores verifying there keeps the event loop responsive under load. On a single core it only adds overhead, measure with `python -m benchmarks.verify` before turning it on. It's shut down by :meth:`shutdown`.
+    http: HTTPClient The HTTPClient object that is used to make requests. Pass `ratelimiter` to choose where its rate limit state is kept, e.g. a :class:`SharedRateLimiter` when running several workers, or pass your own `http` to configure its connection pool.
     commands: List[Union[SlashCommand, UserCommand, MessageCommand]] The list of commands that you have created.
     synced_commands: bool Whether or not the sync_commands method has been called to sync commands with Discord.
+    defer_after: Optional[float] How many seconds a callback has to respond before it's automatically deferred. Discord gives up after 3. None disables it. Commands can override it with their own `defer_after`, where None never defers that command, and ask for an ephemeral deferral with `defer_ephemeral`.
+    auto_deferrals: Counter How many times each command (by its full name, e.g. "admin config set") has been automatically deferred.
+    cache: EntityCache The users, members, channels and messages seen in interactions and REST responses. The `fetch_*` methods look in it before making a request, `cache.stats()` has its hits, misses and evictions.
+    identity_from_cache: bool Each request gets an :class:`IdentityMap`, so a user appearing several times in it is only built once. With this the map also reuses the user and member objects in `cache`, so they're shared between requests too. They're still built from each payload and the cached objects are refreshed with it, so permissions, nicks and roles are always the request's own.
 
     Methods:
     --------
-    `async`:meth:`process_commands(request)` - Request class from Quart.
+    `async`:meth:`process_commands()` - Handles the current request, call this from a Quart route.
+
+    `async`:meth:`process_starlette(request)` - Handles `request`, call this from a Starlette or FastAPI route.
+
+    `async`:meth:`handle(body: bytes, signature: str, timestamp: str, headers: dict, *, response_sent: Optional[Event])` - Handles a request without any web framework, returning the status code and body. Set `response_sent` once the body is written.
+
+    The Interface itself is also an ASGI application, so it can be served directly, e.g. `uvicorn bot:client`.
+
+    `async`:meth:`startup()` - Starts the HTTPClient, warming up its connections. Run from the ASGI lifespan, call it from your framework's startup hook (e.g. Quart's `before_serving`) otherwise.
+
+    `async`:meth:`shutdown(timeout: float)` - Waits up to `timeout` seconds for callbacks that are still running, then closes the HTTPClient. Run from the ASGI lifespan, call it from your framework's shutdown hook otherwise.
+
+    :meth:`add_command(command)` - Registers a command object. The decorators below call this for you.
+
+    :meth:`remove_command(name: str, *, type: int)` - Unregisters a command and all of its subcommands.
+
+    :meth:`add_template(template: ResponseTemplate, *, name: str, description: str, type: int, guild_ids: Optional[List[str]])` - Registers a command that always answers with `template`, straight from the endpoint.
+
+    :meth:`find_callback(type: int, name: str, path: tuple)` - Looks up the callback for a command or subcommand.
+
+    `async`:meth:`fetch_user(user_id: str)` - Gets a user, from the cache if it's there.
+
+    `async`:meth:`fetch_member(guild_id: str, user_id: str)` - Gets a guild member, from the cache if it's there.
+
+    `async`:meth:`fetch_channel(channel_id: str)` - Gets a channel or thread, from the cache if it's there.
+
+    :meth:`verify_signature(body: bytes, signature: str, timestamp: str)` - Checks the Ed25519 signature of a raw request body.
+
+    `async`:meth:`verify_request(body: bytes, signature: str, timestamp: str)` - Same as above, but runs on the thread pool if `verify_in_thread` was passed.
 
     Decorators:
     -----------
@@ -79,43 +322,196 @@ class Interface:
 
     :meth:`message_command(*, name: str)` - Makes a Message Command.
 
+    :meth:`component(*, custom_id: str)` - Makes a function the callback for the buttons and select menus with `custom_id`.
+
+    :meth:`modal(*, custom_id: str)` - Makes a function the callback for submissions of the modal with `custom_id`.
+
+    :meth:`autocomplete(*, name: str, path: tuple)` - Makes a function answer the autocomplete requests of a Slash Command, or of one of its subcommands with `path`.
+
+    Interactions without a callback, and callbacks that return without responding, are logged as errors. Components and autocomplete are then acknowledged (without a change, or with no choices) so Discord gets a valid response, anything else is answered with a 500.
+
     *async*:meth:`sync_commands()` - Syncs the commands that you have created with Discord. This will overwrite all existing commands on Discord.
     """
-    def __init__(self, *, public_key: str):
+    def __init__(self, *, public_key: str, verify_in_thread: bool = False, verify_workers: int = 2, defer_after: Optional[float] = 2.2, ratelimiter: Optional[BaseRateLimiter] = None, http: Optional[HTTPClient] = None, cache: Optional[EntityCache] = None, identity_from_cache: bool = False):
         self.key: str = public_key
+        self.defer_after: Optional[float] = defer_after
+        self.auto_deferrals: Counter = Counter()
+        self.verify_key: VerifyKey = VerifyKey(bytes.fromhex(public_key))
+        self.verify_executor: Optional[ThreadPoolExecutor] = ThreadPoolExecutor(max_workers = verify_workers, thread_name_prefix = "EpikInteractions-verify") if verify_in_thread else None
         self.commands: List[Union[SlashCommand, UserCommand, MessageCommand]] = []
+        self._command_index: Dict[Tuple[int, str], Union[SlashCommand, UserCommand, MessageCommand]] = {}
+        self._command_routes: Dict[Tuple[int, str], List[tuple]] = {}
+        self._routes: Dict[tuple, callable] = {}
+        self._autocomplete_routes: Dict[tuple, callable] = {}
+        self._component_callbacks: Dict[str, callable] = {}
+        self._modal_callbacks: Dict[str, callable] = {}
         self._synced_commands: bool = False
-        self.session: HTTPClient = HTTPClient()
+        self._pending_callbacks: Set[Task] = set()
+        self.http: HTTPClient = http or HTTPClient(ratelimiter = ratelimiter)
+        self.cache: EntityCache = cache or EntityCache()
+        self.identity_from_cache: bool = identity_from_cache
     
-    def command(self, *, name: str, description: str, guild_ids: Optional[List[str]] = [], options: Optional[AnyOption] = []):
+    def command(self, *, name: str, description: str, guild_ids: Optional[List[str]] = [], options: Optional[AnyOption] = [], defer_after: Optional[float] = MISSING, defer_ephemeral: bool = False):
         def register_slash_command(func):
-            self.commands.append(SlashCommand(**{
+            self.add_command(SlashCommand(**{
                 "callback": func,
                 "name": name,
                 "description": description,
                 "guild_ids": guild_ids,
                 "options": options,
-                "type": 1
-            })) # Cheat method.
+                "defer_after": defer_after,
+                "defer_ephemeral": defer_ephemeral
+            }))
+            return func
         return register_slash_command
 
-    def user_command(self, *, name: str):
+    def user_command(self, *, name: str, defer_after: Optional[float] = MISSING, defer_ephemeral: bool = False):
         def register_slash_command(func):
-            self.commands.append(UserCommand(**{
+            self.add_command(UserCommand(**{
                 "callback": func,
                 "name": name,
+                "defer_after": defer_after,
+                "defer_ephemeral": defer_ephemeral
             }))
+            return func
         return register_slash_command
 
-    def message_command(self, *, name: str):
+    def message_command(self, *, name: str, defer_after: Optional[float] = MISSING, defer_ephemeral: bool = False):
         def register_slash_command(func):
-
-            self.commands.append(MessageCommand(**{
+            self.add_command(MessageCommand(**{
                 "callback": func,
                 "name": name,
+                "defer_after": defer_after,
+                "defer_ephemeral": defer_ephemeral
             }))
+            return func
         return register_slash_command
 
+    def component(self, *, custom_id: str):
+        def register_component_callback(func):
+            self._component_callbacks[custom_id] = func
+            return func
+        return register_component_callback
+
+    def modal(self, *, custom_id: str):
+        def register_modal_callback(func):
+            self._modal_callbacks[custom_id] = func
+            return func
+        return register_modal_callback
+
+    def autocomplete(self, *, name: str, path: tuple = ()):
+        def register_autocomplete_callback(func):
+            self._autocomplete_routes[(1, name) + tuple(path)] = func
+            return func
+        return register_autocomplete_callback
+
+    def add_command(self, command: Union[SlashCommand, UserCommand, MessageCommand]):
+        """
+        Registers a command and indexes every route it can be invoked through.
+        """
+        key = (command.type, command.name)
+        if key in self._command_index:
+            # Replacing a command keeps the autocomplete registered for it.
+            self._unregister(key)
+
+        self.commands.append(command)
+        self._command_index[key] = command
+        self._command_routes[key] = []
+
+        for path, callback in command.routes():
+            route = key + path
+            self._routes[route] = callback
+            self._command_routes[key].append(route)
+
+    def add_template(self, template: ResponseTemplate, *, name: str, description: str = "", type: int = 1, guild_ids: Optional[List[str]] = None) -> ResponseTemplate:
+        """
+        Registers a command whose response is always `template`. Its body was encoded when the template was made, so the endpoint returns it without starting a callback.
+        """
+        if type == 1:
+            command = SlashCommand(name = name, description = description, callback = template, guild_ids = guild_ids, options = None)
+        elif type == 2:
+            command = UserCommand(name = name, callback = template)
+        else:
+            command = MessageCommand(name = name, callback = template)
+        self.add_command(command)
+        return template
+
+    def remove_command(self, name: str, *, type: int = 1) -> Optional[Union[SlashCommand, UserCommand, MessageCommand]]:
+        """
+        Unregisters a command, along with all of its subcommand routes and autocomplete callbacks.
+        """
+        key = (type, name)
+        command = self._unregister(key)
+        if command:
+            # Autocomplete is registered apart from the command, on its subcommands' routes too.
+            for route in [route for route in self._autocomplete_routes if route[:2] == key]:
+                del self._autocomplete_routes[route]
+        return command
+
+    def _unregister(self, key: Tuple[int, str]) -> Optional[Union[SlashCommand, UserCommand, MessageCommand]]:
+        command = self._command_index.pop(key, None)
+        if not command:
+            return None
+
+        for route in self._command_routes.pop(key, []):
+            self._routes.pop(route, None)
+        self.commands.remove(command)
+        return command
+
+    def get_command(self, name: str, *, type: int = 1) -> Optional[Union[SlashCommand, UserCommand, MessageCommand]]:
+        return self._command_index.get((type, name))
+
+    def find_callback(self, type: int, name: str, path: tuple = ()) -> Optional[callable]:
+        """
+        Finds the callback for a command, e.g. `find_callback(1, "admin", ("config", "set"))` for `/admin config set`.
+        """
+        return self._routes.get((type, name) + path)
+
+    async def fetch_user(self, user_id: str) -> User:
+        user = self.cache.get_user(user_id)
+        if user:
+            return user
+        response = await self.http.get(f"users/{user_id}")
+        if response.status == 404:
+            raise NotFound404("The user you are trying to fetch does not exist")
+        return self.cache.add_user(User(self, await response.json()))
+
+    async def fetch_member(self, guild_id: str, user_id: str) -> GuildMember:
+        member = self.cache.get_member(guild_id, user_id)
+        if member:
+            return member
+        response = await self.http.get(f"guilds/{guild_id}/members/{user_id}")
+        if response.status == 404:
+            raise NotFound404("The member you are trying to fetch does not exist")
+        return self.cache.add_member(guild_id, GuildMember(self, await response.json()))
+
+    async def fetch_channel(self, channel_id: str):
+        channel = self.cache.get_channel(channel_id)
+        if channel:
+            return channel
+        response = await self.http.get(f"channels/{channel_id}")
+        if response.status == 404:
+            raise NotFound404("The channel you are trying to fetch does not exist")
+        return self.cache.add_channel(channel_from_type(self, await response.json()))
+
+    def verify_signature(self, body: bytes, signature: str, timestamp: str) -> bool:
+        """
+        Checks that `body` was signed by Discord. Works on the raw bytes of the request so there's no decoding involved.
+        """
+        try:
+            self.verify_key.verify(timestamp.encode() + body, bytes.fromhex(signature))
+        except (BadSignatureError, ValueError):
+            return False
+        return True
+
+    async def verify_request(self, body: bytes, signature: str, timestamp: str) -> bool:
+        """
+        Same as :meth:`verify_signature` but hands the work off to the thread pool when `verify_in_thread` is enabled, so the event loop can run other requests while it waits (when there's a free core to verify on).
+        """
+        if not self.verify_executor:
+            return self.verify_signature(body, signature, timestamp)
+        return await get_running_loop().run_in_executor(self.verify_executor, self.verify_signature, body, signature, timestamp)
+
     def synced_commands(self):
         return self._synced_commands
 
@@ -164,26 +560,181 @@ class Interface:
 
     async def process_commands(self):
         """
-        Process commands on this endpoint.
+        Process commands on this endpoint, from inside a Quart route.
         """
-        interaction_data = await request.get_data().decode("utf-8")
+        return await process_quart(self)
 
-        verify_key = VerifyKey(bytes.fromhex(self.key))
+    async def process_starlette(self, request):
+        """
+        Process commands on this endpoint, from inside a Starlette or FastAPI route. `request` is the route's Request.
+        """
+        return await process_starlette(self, request)
+
+    async def __call__(self, scope: dict, receive: callable, send: callable):
+        """
+        The Interface is an ASGI application that serves the interactions endpoint by itself, e.g. `uvicorn bot:client`.
+        """
+        if scope["type"] == "lifespan":
+            return await self._lifespan(receive, send)
+        if scope["type"] != "http":
+            return
+
+        if scope["method"] != "POST":
+            return await self._send_response(send, 405, None)
+
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body"):
+                break
+
+        headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in scope["headers"]}
+        response_sent = Event()
+        status, body = await self.handle(b"".join(chunks), headers.get("x-signature-ed25519", ""), headers.get("x-signature-timestamp", ""), headers, response_sent = response_sent)
+        try:
+            await self._send_response(send, status, body)
+        finally:
+            response_sent.set()
+
+    async def _send_response(self, send: callable, status: int, body: Optional[bytes]):
+        headers = [(b"content-length", str(len(body or b"")).encode())]
+        if body:
+            headers.append((b"content-type", b"application/json"))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body or b""})
+
+    async def startup(self):
+        await self.http.start()
+
+    async def shutdown(self, timeout: float = 10.0):
+        if self._pending_callbacks:
+            _, pending = await wait(self._pending_callbacks, timeout = timeout)
+            if pending:
+                logger.warning(f"Closing with {len(pending)} callbacks still running.")
+        if self.verify_executor:
+            self.verify_executor.shutdown(wait = False)
+        await self.http.close()
+
+    async def _lifespan(self, receive: callable, send: callable):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.startup()
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed", "message": repr(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def handle(self, body: bytes, signature: str, timestamp: str, headers: dict, *, response_sent: Optional[Event] = None) -> Tuple[int, Optional[bytes]]:
+        """
+        Handles one request to the interactions endpoint, independent of any web framework. Returns the status code and body to respond with.
+
+        The first response the callback makes (a reply or a defer) is returned as the body of this request, rather than being sent to Discord separately. The callback carries on in the background after that, and anything else it sends are follow-ups.
+
+        Pass `response_sent` and set it once the body has been written, follow-ups and edits wait for it so they don't reach Discord before the response they follow. Without it they aren't held back.
+        """
+        if not await self.verify_request(body, signature, timestamp):
+            return 401, None
+        data = loads(body)
 
-        signature = request.headers["X-Signature-Ed25519"]
-        timestamp = request.headers["X-Signature-Timestamp"]
+        # Callbacks are started from here, so they copy this context and keep the map for as long as they run.
+        token = current_identity_map.set(IdentityMap(cache = self.cache if self.identity_from_cache else None, guild_id = data.get("guild_id")))
         try:
-            verify_key.verify(f'{timestamp}{interaction_data}'.encode(), bytes.fromhex(signature))
-        except BadSignatureError:
-            return Response(status = 401)
-        interaction = interaction_from_type(interaction_data)
+            interaction = interaction_from_type(self, data, headers)
+            if self.http.application_id is None:
+                self.http.application_id = str(interaction.application_id)
+            if response_sent is not None:
+                interaction.response_sent = response_sent
+            else:
+                interaction.response_sent.set()
+            return await self._dispatch(interaction)
+        finally:
+            current_identity_map.reset(token)
 
+    async def _dispatch(self, interaction: BaseInteraction) -> Tuple[int, Optional[bytes]]:
         if interaction.is_ping():
-            return jsonify({
+            return 200, dumps({
                 "type": 1
             })
 
+        defer_after, ephemeral = self.defer_after, False
         if interaction.is_application_command():
-            command = self.commands.get(interaction.command_name)
-            if command:
-                await command.callback(interaction)
\ No newline at end of file
+            name = " ".join((interaction.command_name,) + interaction.command_path)
+            callback = self.find_callback(interaction.command_type, interaction.command_name, interaction.command_path)
+            if callback:
+                command = self.get_command(interaction.command_name, type = interaction.command_type)
+                if command.defer_after is not MISSING:
+                    defer_after = command.defer_after
+                ephemeral = command.defer_ephemeral
+        elif interaction.is_autocomplete():
+            name = f"autocomplete for {' '.join((interaction.command_name,) + interaction.command_path)}"
+            callback = self._autocomplete_routes.get((interaction.command_type, interaction.command_name) + interaction.command_path)
+        elif interaction.is_message_component():
+            name = f"component {interaction.custom_id}"
+            callback = self._component_callbacks.get(interaction.custom_id)
+        elif interaction.is_modal_submit():
+            name = f"modal {interaction.custom_id}"
+            callback = self._modal_callbacks.get(interaction.custom_id)
+        else:
+            name, callback = f"interaction type {interaction.type}", None
+
+        if not callback:
+            logger.error(f"There's no callback for {name}.")
+            return self._fallback_response(interaction)
+        if isinstance(callback, ResponseTemplate):
+            return 200, callback.render(interaction)
+
+        payload = await self.run_callback(callback, interaction, defer_after = defer_after, ephemeral = ephemeral, name = name)
+        if not payload:
+            return self._fallback_response(interaction)
+        # Templates used from a callback respond with their rendered bytes.
+        return 200, payload if isinstance(payload, bytes) else dumps(payload)
+
+    def _fallback_response(self, interaction: BaseInteraction) -> Tuple[int, Optional[bytes]]:
+        """
+        A valid response for an interaction nothing answered, so Discord isn't sent an empty one. Autocomplete gets no choices, components (and modals opened from one) are acknowledged without changing their message. Other interactions have no response that doesn't show something, they get a 500.
+        """
+        if interaction.is_autocomplete():
+            return 200, dumps({"type": 8, "data": {"choices": []}})
+        if interaction.is_message_component() or (interaction.is_modal_submit() and interaction.raw_data.get("message")):
+            return 200, dumps({"type": 6})
+        return 500, None
+
+    async def run_callback(self, callback: callable, interaction: BaseInteraction, *, defer_after: Optional[float] = None, ephemeral: bool = False, name: Optional[str] = None) -> Optional[dict]:
+        """
+        Runs `callback` until it responds to `interaction`, and returns that response, or None if it finished (or raised) without responding. If it's still running it's left to finish in the background. Exceptions are logged, not raised.
+
+        If the callback hasn't responded within `defer_after` seconds the interaction is deferred for it (ephemerally if `ephemeral` is passed), and its first reply edits that deferred response instead. With `defer_after` None it's never deferred.
+        """
+        task = get_running_loop().create_task(callback(interaction))
+        await wait((task, interaction.response), timeout = defer_after, return_when = FIRST_COMPLETED)
+
+        if not task.done() and not interaction.responded:
+            await interaction.defer(ephemeral = ephemeral)
+            interaction.auto_deferred = True
+            self.auto_deferrals[name or getattr(callback, "__name__", repr(callback))] += 1
+            logger.debug(f"Automatically deferred {name} after {defer_after}s.")
+
+        # Finished callbacks go through here too, so one that responded and then raised is still logged.
+        if not task.done():
+            self._pending_callbacks.add(task)
+        task.add_done_callback(self._callback_done)
+
+        if not interaction.responded:
+            # It's finished without responding, if it raised that's logged by _callback_done.
+            if not task.cancelled() and task.exception() is None:
+                logger.error(f"The callback for {name} returned without responding to the interaction. Callbacks need to reply, defer or update before they return.")
+            return None
+
+        return interaction.response.result()
+
+    def _callback_done(self, task: Task):
+        self._pending_callbacks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.exception("Ignoring exception in interaction callback", exc_info = task.exception())
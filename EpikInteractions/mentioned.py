@@ -1,21 +1,28 @@
 from .user import User
 from .member import GuildMember
 from typing import Optional, List
+from .snowflake import Snowflake, snowflake
 
 class MentionedChannel:
+    __slots__ = ("id", "guild_id", "type", "name")
+
     def __init__(self, data: dict):
-        self.id: str = data.get("id")
-        self.guild_id: str = data.get("guild_id")
+        self.id: Snowflake = snowflake(data.get("id"))
+        self.guild_id: Snowflake = snowflake(data.get("guild_id"))
         self.type: int = data.get("type")
         self.name: str = data.get("name")
 
 
 class MentionedUser(User):
+    __slots__ = ("member",)
+
     def __init__(self, client, data: dict):
         super().__init__(client, data)
         self.member = GuildMember(client, data.get("member")) if data.get("member") else None
 
 class MessageActivity:
+    __slots__ = ("type", "party_id")
+
     def __init__(self, data: dict):
         self.type: int = data.get("type")
         self.party_id: Optional[str] = data.get("party_id")
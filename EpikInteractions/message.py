@@ -6,6 +6,7 @@ from typing import (
     Optional,
     Union,
     List,
+    Tuple,
     Any
 )
 from .application import Application
@@ -14,19 +15,28 @@ from .user import *
 from .mentioned import *
 from .member import GuildMember
 from .components import *
+from .exceptions import HTTPException
+from .pagination import Paginator
+from .cache import cache_of
+from .identity import identity
 from logging import getLogger
+from .snowflake import Snowflake, Snowflakes, snowflake
+from .timestamps import Timestamp
+from datetime import datetime
 
 logger = getLogger(__name__)
 
 
 class MessageInteraction:
+    __slots__ = ("id", "type", "name", "user", "member")
+
     def __init__(self, client, data: dict):
-        self.id: str = data.get("id")
+        self.id: Snowflake = snowflake(data.get("id"))
         self.type: int = data.get("type")
         self.name: str = data.get("name")
-        self.user: User = User(client, data.get("user"))
+        user = data.get("user")
+        self.user: User = identity("users", user["id"], lambda: User(client, user))
         self.member: Optional[GuildMember] = GuildMember(client, data.get("member")) if data.get("member") else None
-        self.user: User = User(client, data.get("user"))
 
 
 class Message:
@@ -42,22 +52,30 @@ class Message:
         The author of the message 
     guild_id: str
         The Guild ID the message was sent in"""
+    __slots__ = ("client", "id", "channel_id", "guild_id", "webhook_id", "author", "member", "content", "_timestamp", "_edited_timestamp", "tts", "mention_everyone", "mentions", "_mention_roles", "mention_channels", "embeds", "reactions", "nonce", "pinned", "type", "activity", "application", "flags", "referenced_message", "interaction", "thread", "components", "stickers")
+
+    timestamp: datetime = Timestamp()
+    edited_timestamp: Optional[datetime] = Timestamp()
+    mention_roles: Tuple[Snowflake, ...] = Snowflakes()
+
     def __init__(self, client, data: dict):
         self.client = client
-        self.id: str = data.get("id")
-        self.channel_id: str = data.get("channel_id")
-        self.guild_id: Optional[str] = data.get("guild_id")
-        self.webhook_id: Optional[str] = data.get("webhook_id")
-        self.author: Optional[Union[WebhookUser, User]] = WebhookUser(data.get("author")) if data.get("webhook_id") else User(client, data.get("author"))
+        self.id: Snowflake = snowflake(data.get("id"))
+        self.channel_id: Snowflake = snowflake(data.get("channel_id"))
+        self.guild_id: Optional[Snowflake] = snowflake(data.get("guild_id"))
+        self.webhook_id: Optional[Snowflake] = snowflake(data.get("webhook_id"))
+        author = data.get("author")
+        self.author: Optional[Union[WebhookUser, User]] = WebhookUser(author) if data.get("webhook_id") else identity("users", author["id"], lambda: User(client, author))
         self.member: GuildMember = GuildMember(client, data.get("member")) if data.get("member") else None
         # I forgot Message Intents are gonna stop this.
         self.content: Optional[str] = data.get("content")
-        self.timestamp: str = data.get("timestamp")
-        self.edited_timestamp: Optional[str] = data.get("edited_timestamp")
+        self._timestamp: str = data.get("timestamp")
+        self._edited_timestamp: Optional[str] = data.get("edited_timestamp")
         self.tts: bool = data.get("tts")
         self.mention_everyone: bool = data.get("mention_everyone")
-        self.mentions: Optional[List[MentionedUser]] = [MentionedUser(client, mention) for mention in data.get("mentions", [])]
-        self.mention_roles: Optional[List[int]] = data.get("mention_roles")
+        # Mentions can carry a member, so they're mapped apart from plain users.
+        self.mentions: Optional[List[MentionedUser]] = [identity("mentions", mention["id"], lambda mention = mention: MentionedUser(client, mention)) for mention in data.get("mentions", [])]
+        self._mention_roles: Optional[list] = data.get("mention_roles")
         self.mention_channels: Optional[List[MentionedChannel]] = [MentionedChannel(channel) for channel in data.get("mention_channels", [])]
         self.embeds: Optional[List[Embed]] = [Embed(**embed) for embed in data.get("embeds", [])]
         self.reactions: Optional[List[Reaction]] = [Reaction(reaction) for reaction in data.get("reactions", [])]
@@ -74,21 +92,8 @@ class Message:
         self.interaction: Optional[MessageInteraction] = MessageInteraction(
             client, data.get("interaction")) if data.get("interaction") else None
         self.thread: Optional[Thread] = Thread(
-            data.get("thread")) if data.get("thread") else None
-
-        components: List[Any] = []
-        if data.get("components"):
-            for component in data.get("components"):
-                if component.get("type") == 1:
-                    components.append(MessageActionRow(component))
-                elif component.get("type") == 2:
-                    components.append(MessageButton(component))
-                elif components.get("type") == 3:
-                    components.append(MessageSelectMenu(component))
-                elif components.get("type") == 4:
-                    components.append(MessageTextInput(component))
-
-        self.components: Optional[List[Union[MessageTextInput, MessageSelectMenu, MessageButton]]] = components
+            client, data.get("thread")) if data.get("thread") else None
+        self.components: Optional[List[Union[MessageActionRow, MessageTextInput, MessageSelectMenu, MessageButton]]] = [component_from_type(component) for component in data.get("components", [])]
         self.stickers: Optional[List[StickerItem]] = [StickerItem(
             sticker) for sticker in data.get("stickers", [])] or None
 
@@ -108,10 +113,25 @@ class Message:
             response = await self.client.http.delete(f"channels/{self.channel_id}/messages/{self.id}/reactions/{emoji}/{user.id}")
         return await response.json()
 
-    async def fetch_reactions(self, *, after, limit) -> List[Reaction]:
+    async def fetch_reactions(self, emoji: str, *, after: Optional[str] = None, limit: Optional[int] = None) -> List[User]:
         logger.debug(f"Fetching reactions from message ({self.id}).")
-        response = await self.client.http.get(f"channels/{self.channel_id}/messages/{self.id}/reactions?after={after}&limit={limit}")
-        return await response.json()
+        params = {name: value for name, value in {"after": after, "limit": limit}.items() if value is not None}
+        response = await self.client.http.get(f"channels/{self.channel_id}/messages/{self.id}/reactions/{quote(emoji)}", params=params)
+        return [User(self.client, user) for user in await response.json()]
+
+    def iter_reactions(self, emoji: str, *, limit: Optional[int] = None, after: Optional[str] = None, prefetch: bool = True) -> Paginator:
+        """
+        Iterates over every user that reacted with `emoji`. Use with `async for`, the pages are fetched as they're needed.
+        """
+        async def fetch_page(cursor: Optional[str], page_limit: int):
+            params = {name: value for name, value in {"after": cursor, "limit": page_limit}.items() if value is not None}
+            response = await self.client.http.get(f"channels/{self.channel_id}/messages/{self.id}/reactions/{quote(emoji)}", params=params)
+            if response.status >= 400:
+                raise HTTPException(f"Fetching the reactions to message ({self.id}) failed with status {response.status}.")
+            users = await response.json()
+            return users, len(users) == page_limit
+
+        return Paginator(fetch_page, cursor = after, cursor_of = lambda user: user["id"], parse = lambda user: User(self.client, user), limit = limit, prefetch = prefetch)
 
     async def delete_all_reactions(self):
         logger.debug(f"Deleting all reactions from message ({self.id}).")
@@ -129,13 +149,20 @@ class Message:
         logger.debug(
             f"Editing message {self.id} with message_data {message_data}.")
         response = await self.client.http.patch(f"channels/{self.channel_id}/messages/{self.id}", data=message_data)
+        self._uncache()
         return await response.json()
 
     async def delete(self):
         logger.debug(f"Deleting message {self.id}.")
         response = await self.client.http.delete(f"channels/{self.channel_id}/messages/{self.id}")
+        self._uncache()
         return await response.json()
 
+    def _uncache(self):
+        cache = cache_of(self.client)
+        if cache:
+            cache.messages.pop(self.id)
+
     async def pin(self, *, reason: Optional[str]):
         headers = self.client.http.headers.copy()
         if reason:
@@ -156,13 +183,14 @@ class Message:
         response = await self.client.http.delete(f"channels/{self.channel_id}/pins/{self.id}", headers=headers)
         return await response.json()
 
-    async def start_thread(self, name: str, auto_archive_duration: Optional[int], rate_limit_per_user: Optional[int]):
+    async def start_thread(self, name: str, auto_archive_duration: Optional[int] = None, rate_limit_per_user: Optional[int] = None):
         logger.debug(
             f"Starting thread for message {self.id} with name {name}, auto archive duration {auto_archive_duration or None}, ratelimit per user {rate_limit_per_user or None}.")
-        response = await self.client.http.post(f"channels/{self.channel_id}/messages/{self.id}/threads", data={"name": name, "auto_archive_duration": auto_archive_duration, "rate_limit_per_user": rate_limit_per_user})
-        # Cache it
-        self.client.guilds[self.guild_id].append(Thread(await response.json()))
-        return Thread(await response.json())
+        data = {name: value for name, value in {"name": name, "auto_archive_duration": auto_archive_duration, "rate_limit_per_user": rate_limit_per_user}.items() if value is not None}
+        response = await self.client.http.post(f"channels/{self.channel_id}/messages/{self.id}/threads", json=data)
+        thread = Thread(self.client, await response.json())
+        cache = cache_of(self.client)
+        return cache.add_channel(thread) if cache else thread
 
     async def crosspost(self):
         logger.debug(f"Crossposting message {self.id}.")
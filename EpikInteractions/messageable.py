@@ -0,0 +1,198 @@
+from .exceptions import HTTPException
+from .file import File
+from .pagination import Paginator
+from .scheduler import Priority
+from .snowflake import Snowflake, snowflake
+from .cache import cache_of
+from .serialization import serialize
+from asyncio import Task, get_running_loop, gather
+from collections import deque
+from logging import getLogger
+from time import time
+from typing import (
+    Optional,
+    List,
+    Union,
+    Iterable,
+    AsyncIterable,
+    Deque
+)
+
+logger = getLogger(__name__)
+
+# Bulk delete only takes messages younger than 14 days, the margin keeps a batch from ageing past that while it waits for the rate limit.
+BULK_DELETE_MAX_AGE = 14 * 24 * 60 * 60 - 60
+
+# Message is imported inside the methods below, message.py depends on this module (through User) so it can't be imported up here.
+
+class Messageable:
+    # Mixed into channels that already have `id` and `client` slots, so subclasses declare them instead.
+    __slots__ = ()
+
+    def __init__(self, client, channel_id: str):
+        self.id: Snowflake = snowflake(channel_id)
+        self.client = client
+
+    async def fetch_messages(self, *, around: Optional[str] = None, before: Optional[str] = None, after: Optional[str] = None, limit: Optional[int] = None) -> List["Message"]:
+        from .message import Message
+        params = {"around": around, "before": before, "after": after, "limit": limit}
+        response = await self.client.http.get(f"channels/{self.id}/messages", params={name: value for name, value in params.items() if value is not None})
+        data = await response.json()
+        messages = [Message(self.client, message) for message in data]
+        cache = cache_of(self.client)
+        if cache:
+            for message in messages:
+                cache.add_message(message)
+        return messages
+
+    async def fetch_message(self, *, message_id: str) -> "Message":
+        from .message import Message
+        cache = cache_of(self.client)
+        message = cache.get_message(message_id) if cache else None
+        if message:
+            return message
+
+        response = await self.client.http.get(f"channels/{self.id}/messages/{message_id}")
+        data = await response.json()
+        message = Message(self.client, data)
+        return cache.add_message(message) if cache else message
+
+    async def send(self, content: Optional[str] = None, *, embeds: Optional[List[dict]] = None, components=None, tts: Optional[bool] = False, allowed_mentions=None, sticker_ids: Optional[List[str]] = None, attachments: List[File]=None, suppress_embeds: bool = False) -> "Message":
+        from .message import Message
+        payload = {}
+
+        if content:
+            payload["content"] = content
+
+        if embeds:
+            payload["embeds"] = [serialize(embed) for embed in embeds]
+
+        if components:
+            payload["components"] = [serialize(component) for component in components]
+
+        if tts:
+            payload["tts"] = tts
+
+        if allowed_mentions:
+            payload["allowed_mentions"] = allowed_mentions.to_dict()
+
+        if sticker_ids:
+            payload["sticker_ids"] = sticker_ids
+
+        if attachments:
+            payload["attachments"] = [attachment.to_dict(index)
+                                      for index, attachment in enumerate(attachments)]
+
+        if suppress_embeds:
+            payload["suppress_embeds"] = 1 << 2
+
+        response = await self.client.http.post(f"channels/{self.id}/messages", json=payload, files=attachments)
+        data = await response.json()
+        message = Message(self.client, data)
+        cache = cache_of(self.client)
+        return cache.add_message(message) if cache else message
+
+
+class GuildMessageable(Messageable):
+    """
+    What only guild text channels and threads can do with their messages: page through their whole history and bulk delete. Users and DM channels only get :class:`Messageable`.
+    """
+    __slots__ = ()
+
+    def iter_messages(self, *, limit: Optional[int] = None, before: Optional[str] = None, after: Optional[str] = None, prefetch: bool = True) -> Paginator:
+        """
+        Iterates over the channel's messages, newest first, or oldest first if `after` is passed. Use with `async for`, the pages are fetched as they're needed.
+        """
+        from .message import Message
+
+        async def fetch_page(cursor: Optional[str], page_limit: int):
+            params = {"limit": page_limit, "after" if after else "before": cursor}
+            response = await self.client.http.get(f"channels/{self.id}/messages", params={name: value for name, value in params.items() if value is not None})
+            if response.status >= 400:
+                raise HTTPException(f"Fetching messages from channel ({self.id}) failed with status {response.status}.")
+            messages = await response.json()
+            # The response can be shared with coalesced requests, so it's reversed into a copy.
+            if after:
+                messages = messages[::-1]
+            return messages, len(messages) == page_limit
+
+        return Paginator(fetch_page, cursor = after or before, cursor_of = lambda message: message["id"], parse = lambda message: Message(self.client, message), limit = limit, prefetch = prefetch)
+
+    async def bulk_delete(self, message_ids: Union[Iterable[str], AsyncIterable[str]], *, reason: Optional[str] = None, delete_old: bool = False, max_pending: int = 4) -> int:
+        """
+        Deletes any number of messages, returning how many were deleted. `message_ids` can be any iterable or async iterable (like :meth:`iter_messages` mapped to ids), it's consumed as the batches are sent.
+
+        Ids are sent 100 at a time, which is the most Discord takes per request. Messages older than 14 days can't be bulk deleted, they're skipped unless `delete_old` is passed, then they're deleted one by one, as is a batch Discord rejects. Up to `max_pending` requests are handed to the rate limiter at once, at background priority.
+        """
+        headers = {"X-Audit-Log-Reason": reason} if reason else None
+        pending: Deque[Task] = deque()
+        deleted = 0
+        seen = set()
+        batch = []
+        # Ids are ints, so comparing against the oldest id allowed is all it takes to check their age.
+        cutoff = Snowflake.from_timestamp(time() - BULK_DELETE_MAX_AGE)
+
+        async def submit(coro):
+            nonlocal deleted
+            pending.append(get_running_loop().create_task(coro))
+            if len(pending) >= max_pending:
+                deleted += await pending.popleft()
+
+        try:
+            async for message_id in _iterate(message_ids):
+                message_id = Snowflake(message_id)
+                if message_id in seen:
+                    continue
+                seen.add(message_id)
+
+                if message_id < cutoff:
+                    if delete_old:
+                        await submit(self._delete_message(message_id, headers))
+                    continue
+
+                batch.append(message_id)
+                if len(batch) == 100:
+                    await submit(self._delete_batch(batch, headers))
+                    batch = []
+
+            if batch:
+                await submit(self._delete_batch(batch, headers))
+            while pending:
+                deleted += await pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        return deleted
+
+    async def _delete_batch(self, message_ids: List[str], headers: Optional[dict]) -> int:
+        if len(message_ids) == 1:
+            # Bulk delete needs at least 2.
+            return await self._delete_message(message_ids[0], headers)
+
+        response = await self.client.http.post(f"channels/{self.id}/messages/bulk-delete", json={"messages": [str(message_id) for message_id in message_ids]}, headers=headers, priority=Priority.BACKGROUND)
+        if response.status == 204:
+            return len(message_ids)
+        if response.status != 400:
+            logger.warning(f"Bulk deleting {len(message_ids)} messages in {self.id} failed with status {response.status}.")
+            return 0
+
+        # One bad id fails the whole batch, e.g. a message that's already been deleted.
+        logger.debug(f"Bulk delete in {self.id} was rejected, deleting {len(message_ids)} messages one by one.")
+        return sum(await gather(*(self._delete_message(message_id, headers) for message_id in message_ids)))
+
+    async def _delete_message(self, message_id: str, headers: Optional[dict]) -> int:
+        response = await self.client.http.delete(f"channels/{self.id}/messages/{message_id}", headers=headers, priority=Priority.BACKGROUND)
+        if response.status == 204:
+            return 1
+        if response.status != 404:
+            logger.warning(f"Deleting message {message_id} in {self.id} failed with status {response.status}.")
+        return 0
+
+async def _iterate(items: Union[Iterable, AsyncIterable]):
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
@@ -1,6 +1,10 @@
+from .snowflake import Snowflake, snowflake
+
 class Overwrite:
+    __slots__ = ("id", "type", "allow", "deny")
+
     def __init__(self, data: dict):
-        self.id: str = data.get("id")
+        self.id: Snowflake = snowflake(data.get("id"))
         self.type: int = data.get("type")
         self.allow: str = data.get("allow")
         self.deny: str = data.get("deny")
@@ -0,0 +1,71 @@
+from asyncio import Task, get_running_loop
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+
+
+class Paginator:
+    """
+    Walks a paginated endpoint, yielding one parsed object at a time.
+
+    `fetch_page(cursor, limit)` requests a single page and returns its raw items along with whether there are more pages after it. The cursor for the next page is taken from the last item of the current one with `cursor_of`, and items are only parsed with `parse` as they're yielded.
+
+    With `prefetch` the next page is requested as soon as the current one arrives, so it's already on its way while the current one is consumed.
+
+    Attributes:
+    -----------
+    limit: Optional[int] How many items are yielded in total. None walks the endpoint to the end.
+    page_size: int The most items Discord returns per page.
+    prefetch: bool Whether the next page is requested while the current one is consumed.
+
+    Methods:
+    --------
+    `async`:meth:`flatten()` - Collects every item into a list.
+    """
+    def __init__(self, fetch_page: Callable[[Any, int], Awaitable[Tuple[List[dict], bool]]], *, cursor: Any = None, cursor_of: Callable[[dict], Any], parse: Callable[[dict], Any], limit: Optional[int] = None, page_size: int = 100, prefetch: bool = True):
+        self.fetch_page = fetch_page
+        self.cursor: Any = cursor
+        self.cursor_of: Callable[[dict], Any] = cursor_of
+        self.parse: Callable[[dict], Any] = parse
+        self.limit: Optional[int] = limit
+        self.page_size: int = page_size
+        self.prefetch: bool = prefetch
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self._walk()
+
+    async def flatten(self) -> list:
+        return [item async for item in self]
+
+    def _next_page(self, cursor: Any, remaining: Optional[int]) -> Task:
+        limit = self.page_size if remaining is None else min(self.page_size, remaining)
+        return get_running_loop().create_task(self.fetch_page(cursor, limit))
+
+    async def _walk(self) -> AsyncIterator[Any]:
+        remaining = self.limit
+        if remaining is not None and remaining <= 0:
+            return
+
+        cursor = self.cursor
+        page = self._next_page(cursor, remaining)
+        try:
+            while page:
+                items, has_more = await page
+                page = None
+                if remaining is not None:
+                    items = items[:remaining]
+                    remaining -= len(items)
+
+                more = bool(items) and has_more and remaining != 0
+                if more:
+                    cursor = self.cursor_of(items[-1])
+                    if self.prefetch:
+                        page = self._next_page(cursor, remaining)
+
+                for item in items:
+                    yield self.parse(item)
+
+                if more and not page:
+                    page = self._next_page(cursor, remaining)
+        finally:
+            # The caller stopped early, don't leave a prefetched page running.
+            if page and not page.cancel() and not page.cancelled():
+                page.exception()
@@ -1,18 +1,19 @@
-from .user import User
 from typing import Optional
-from .member import GuildMember
+from .snowflake import Snowflake, snowflake
 
 
 class PartialEmoji:
+    __slots__ = ("data", "name", "id", "animated")
+
     def __init__(self, data: dict):
         self.data: dict = data
         self.name: str = data.get("name")
-        self.id: str = data.get("id")
+        self.id: Snowflake = snowflake(data.get("id"))
         self.animated: bool = data.get("animated")
 
     def to_dict(self):
         payload = {
-            "id": self.id,
+            "id": str(self.id) if self.id is not None else None,
             "name": self.name,
         }
 
@@ -21,19 +22,12 @@ class PartialEmoji:
 
         return payload
 
-class MessageInteraction:
-    def __init__(self, client, data: dict):
-        self.id: str = data.get("id")
-        self.type: int = data.get("type")
-        self.name: str = data.get("name")
-        self.user: User = User(client, data.get("user"))
-        self.member: Optional[GuildMember] = GuildMember(client, data.get("member")) if data.get("member") else None
-        self.user: User = User(client, data.get("user"))
-
 class PartialUser:
+    __slots__ = ("data", "id", "username", "discriminator", "avatar")
+
     def __init__(self, data: dict):
         self.data: dict = data
-        self.id: str = data.get("id")
+        self.id: Snowflake = snowflake(data.get("id"))
         self.username: str = data.get("username")
         self.discriminator: str = data.get("discriminator")
         self.avatar: Optional[str] = data.get("avatar")
\ No newline at end of file
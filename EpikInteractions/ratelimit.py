@@ -0,0 +1,416 @@
+import os
+from asyncio import sleep, Event, Lock, CancelledError, Future, Task, get_running_loop, start_unix_server, open_unix_connection, StreamReader, StreamWriter
+from fcntl import flock, LOCK_EX, LOCK_NB
+from itertools import count
+from logging import getLogger
+from time import monotonic
+from typing import (
+    Optional,
+    Dict,
+    Tuple
+)
+from .codec import dumps, loads
+
+logger = getLogger(__name__)
+
+MAJOR_PARAMETERS = {
+    "channels": "{channel_id}",
+    "guilds": "{guild_id}",
+    "webhooks": "{webhook_id}"
+}
+
+
+def split_route(method: str, url: str) -> Tuple[str, str]:
+    """
+    Splits a url into the route it belongs to and its major parameters, e.g. `DELETE channels/123/messages/456` becomes `("DELETE channels/{channel_id}/messages/{id}", "123")`.
+
+    Discord gives every combination of route and major parameters its own bucket, the rest of the url doesn't matter.
+    """
+    parts = url.split("?", 1)[0].strip("/").split("/")
+    major = []
+    for index, part in enumerate(parts):
+        previous = parts[index - 1] if index else None
+        if previous in MAJOR_PARAMETERS:
+            major.append(part)
+            parts[index] = MAJOR_PARAMETERS[previous]
+        elif index > 1 and parts[index - 2] == "webhooks":
+            # Webhooks are limited by their id and token together.
+            major.append(part)
+            parts[index] = "{token}"
+        elif previous == "reactions":
+            parts[index] = "{emoji}"
+        elif part.isdigit():
+            parts[index] = "{id}"
+    return f"{method} {'/'.join(parts)}", "/".join(major)
+
+
+class Bucket:
+    """
+    The state of one rate limit bucket.
+
+    Until Discord has told us about a bucket only one request is let through, the rest wait for its response to find out how many they can send.
+
+    Attributes:
+    -----------
+    limit: int How many requests can be made per reset.
+    remaining: int How many requests are left before the bucket resets.
+    reset_at: float When the bucket resets, on the `time.monotonic` clock. Infinite while we don't know.
+    per: Optional[float] For buckets we pace ourselves rather than being told about, how long each window lasts.
+    merged: Optional[Bucket] The bucket this one was merged into, once Discord told us its route shares a bucket with others.
+    """
+    def __init__(self, limit: int = 1, remaining: int = 1, reset_at: float = float("inf"), *, per: Optional[float] = None):
+        self.limit: int = limit
+        self.remaining: int = remaining
+        self.reset_at: float = reset_at
+        self.per: Optional[float] = per
+        self.known: bool = per is not None
+        self.unlimited: bool = False
+        self.merged: Optional["Bucket"] = None
+        self._updated: Event = Event()
+
+    async def acquire(self):
+        """
+        Takes a request from the bucket, waiting for it to reset first if it's empty.
+        """
+        while not self.unlimited:
+            if self.merged is not None:
+                return await self.merged.acquire()
+            now = monotonic()
+            if now >= self.reset_at:
+                # We find out when the next reset is from the next response, unless we're pacing ourselves.
+                self.remaining = self.limit
+                self.reset_at = now + self.per if self.per else float("inf")
+            if self.remaining > 0:
+                self.remaining -= 1
+                return
+            if self.reset_at == float("inf"):
+                await self._updated.wait()
+            else:
+                logger.debug(f"Bucket exhausted, waiting {self.reset_at - now:.2f}s for it to reset.")
+                await sleep(self.reset_at - now)
+
+    def update(self, limit: int, remaining: int, reset_after: float):
+        # Requests still in flight have already taken from this bucket, so never hand back more than we've been told is left.
+        self.remaining = min(self.remaining, remaining) if self.known else remaining
+        self.limit = limit
+        self.known = True
+        self.unlimited = False
+        self.reset_at = monotonic() + reset_after
+        self._wake()
+
+    def release(self):
+        """
+        Called when a response had no rate limit headers. If we still didn't know anything about the bucket, it's treated as unlimited. Otherwise the request is given back, the response (e.g. a 502 from Cloudflare) tells us nothing about the bucket, and without it nothing would ever refill a bucket waiting for its next reset.
+        """
+        if not self.known:
+            self.unlimited = True
+        else:
+            self.remaining = min(self.limit, self.remaining + 1)
+        self._wake()
+
+    def merge_into(self, bucket: "Bucket"):
+        """
+        Called when this route turns out to share `bucket` with other routes. Requests waiting here move over and take from it instead.
+        """
+        self.merged = bucket
+        self._wake()
+
+    def cancel(self):
+        """
+        Gives back a request that was taken from the bucket but never made it to Discord.
+        """
+        self.remaining = min(self.limit, self.remaining + 1)
+        self._wake()
+
+    def _wake(self):
+        # Setting wakes everything waiting right now, clearing straight after means anyone waiting later waits for the next update.
+        self._updated.set()
+        self._updated.clear()
+
+
+RATELIMIT_HEADERS = ("X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset-After", "X-RateLimit-Bucket")
+
+
+class BaseRateLimiter:
+    """
+    What HTTPClient expects of a rate limiter. Subclass this to keep rate limit state somewhere else.
+
+    Methods:
+    --------
+    `async`:meth:`acquire(method: str, url: str)` - Waits until a request can be made.
+
+    :meth:`update(method: str, url: str, headers)` - Called with the headers of every response.
+
+    :meth:`cancel(method: str, url: str)` - Called when an acquired request never reached Discord.
+
+    :meth:`ratelimited(method: str, url: str, retry_after: float, is_global: bool)` - Called when Discord responds with a 429.
+
+    `async`:meth:`close()` - Releases anything the rate limiter holds on to.
+    """
+    async def acquire(self, method: str, url: str):
+        raise NotImplementedError
+
+    def update(self, method: str, url: str, headers):
+        raise NotImplementedError
+
+    def cancel(self, method: str, url: str):
+        raise NotImplementedError
+
+    def ratelimited(self, method: str, url: str, retry_after: float, is_global: bool):
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class RateLimiter(BaseRateLimiter):
+    """
+    Keeps track of Discord's rate limits in this process, so HTTPClient can wait before making a request instead of being told off with a 429.
+
+    Attributes:
+    -----------
+    global_limit: int How many requests can be made each second across all routes. Interaction webhooks don't count towards it.
+    global_bucket: Bucket The bucket for the global limit.
+    buckets: Dict[Tuple[str, str], Bucket] The buckets, by Discord's bucket hash (or the route while that isn't known yet) and major parameters.
+    routes: Dict[str, str] Discord's bucket hash for each route it's told us about.
+    """
+    def __init__(self, *, global_limit: int = 50):
+        self.global_limit: int = global_limit
+        self.global_bucket: Bucket = Bucket(global_limit, global_limit, 0.0, per = 1.0)
+        self.buckets: Dict[Tuple[str, str], Bucket] = {}
+        self.routes: Dict[str, str] = {}
+
+    def get_bucket(self, method: str, url: str) -> Bucket:
+        route, major = split_route(method, url)
+        key = (self.routes.get(route, route), major)
+        bucket = self.buckets.get(key)
+        if not bucket:
+            bucket = self.buckets[key] = Bucket()
+        return bucket
+
+    async def acquire(self, method: str, url: str):
+        if not url.startswith("webhooks/"):
+            await self.global_bucket.acquire()
+        await self.get_bucket(method, url).acquire()
+
+    def update(self, method: str, url: str, headers):
+        """
+        Updates the bucket for a route from the `X-RateLimit-*` headers of its response.
+        """
+        if "X-RateLimit-Limit" not in headers:
+            return self.get_bucket(method, url).release()
+
+        route, major = split_route(method, url)
+        bucket_hash = headers.get("X-RateLimit-Bucket")
+        if bucket_hash and self.routes.get(route) != bucket_hash:
+            # Now that we know which bucket this route is in, move its state over so it's shared with the other routes in it.
+            self.routes[route] = bucket_hash
+            old = self.buckets.pop((route, major), None)
+            bucket = self.buckets.setdefault((bucket_hash, major), old or Bucket())
+            if old and old is not bucket:
+                old.merge_into(bucket)
+
+        self.get_bucket(method, url).update(
+            int(headers["X-RateLimit-Limit"]),
+            int(headers["X-RateLimit-Remaining"]),
+            float(headers["X-RateLimit-Reset-After"])
+        )
+
+    def cancel(self, method: str, url: str):
+        self.get_bucket(method, url).cancel()
+
+    def ratelimited(self, method: str, url: str, retry_after: float, is_global: bool):
+        """
+        Empties the bucket a 429 was for (or the global one) until `retry_after` has passed.
+        """
+        bucket = self.global_bucket if is_global else self.get_bucket(method, url)
+        bucket.remaining = 0
+        bucket.reset_at = monotonic() + retry_after
+        bucket._wake()
+        logger.warning(f"Rate limited on {method} {url}{' (global)' if is_global else ''}, retrying in {retry_after:.2f}s.")
+
+
+class RateLimitCoordinator:
+    """
+    Serves a :class:`RateLimiter` over a Unix socket, so every process using a :class:`SharedRateLimiter` with the same path shares its state.
+
+    You don't need to run this yourself, one of the :class:`SharedRateLimiter`\s starts it. Requests are newline separated JSON, acquires are answered with their id once the request can go ahead. An acquire that's released before then is dropped and answered with its id and `released`, one that was already granted is given back by the client with a `cancel` when the grant reaches it.
+    """
+    def __init__(self, path: str, *, global_limit: int = 50):
+        self.path: str = path
+        self.ratelimiter: RateLimiter = RateLimiter(global_limit = global_limit)
+        self.server = None
+
+    async def start(self):
+        if os.path.exists(self.path):
+            # Left over from a coordinator that died, we only get here once we hold the lock it held.
+            os.unlink(self.path)
+        self.server = await start_unix_server(self._serve, self.path)
+
+    async def _serve(self, reader: StreamReader, writer: StreamWriter):
+        tasks: Dict[int, Task] = {}
+        try:
+            while line := await reader.readline():
+                message = loads(line)
+                op = message["op"]
+                if op == "acquire":
+                    id = message["id"]
+                    task = tasks[id] = get_running_loop().create_task(self._acquire(writer, message))
+                    task.add_done_callback(lambda _, id = id: tasks.pop(id, None))
+                elif op == "release":
+                    # Still waiting, so it hasn't taken anything yet. If it's not here it was granted, and the grant is on its way back.
+                    task = tasks.pop(message["id"], None)
+                    if task and not task.done():
+                        task.cancel()
+                        writer.write(dumps({"id": message["id"], "released": True}) + b"\n")
+                elif op == "update":
+                    self.ratelimiter.update(message["method"], message["url"], message["headers"])
+                elif op == "cancel":
+                    self.ratelimiter.cancel(message["method"], message["url"])
+                elif op == "ratelimited":
+                    self.ratelimiter.ratelimited(message["method"], message["url"], message["retry_after"], message["global"])
+        except (ConnectionError, CancelledError):
+            # Cancelled when the loop of the process running the coordinator shuts down, the other processes will take over.
+            pass
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            writer.close()
+
+    async def _acquire(self, writer: StreamWriter, message: dict):
+        await self.ratelimiter.acquire(message["method"], message["url"])
+        if not writer.is_closing():
+            writer.write(dumps({"id": message["id"]}) + b"\n")
+
+    async def close(self):
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+
+
+class SharedRateLimiter(BaseRateLimiter):
+    """
+    A rate limiter whose state is shared between every process on this host using the same `path`, e.g. several ASGI workers, so together they stay under Discord's limits.
+
+    The first process to take the lock at `path + ".lock"` runs the :class:`RateLimitCoordinator`, the rest connect to it. If that process goes away, whoever notices first takes over.
+
+    Attributes:
+    -----------
+    path: str The Unix socket the coordinator listens on.
+    global_limit: int How many requests can be made each second across all the processes.
+    coordinator: Optional[RateLimitCoordinator] The coordinator, if this process is the one running it.
+    """
+    def __init__(self, path: str = "/tmp/epikinteractions-ratelimit.sock", *, global_limit: int = 50):
+        self.path: str = path
+        self.global_limit: int = global_limit
+        self.coordinator: Optional[RateLimitCoordinator] = None
+        self._lock_fd: Optional[int] = None
+        self._writer: Optional[StreamWriter] = None
+        self._reader_task: Optional[Task] = None
+        self._connecting: Lock = Lock()
+        self._ids = count()
+        self._pending: Dict[int, Tuple[Future, dict]] = {}
+        # Acquires given up on while the coordinator was still deciding, until it says whether it granted them.
+        self._released: Dict[int, dict] = {}
+
+    async def acquire(self, method: str, url: str):
+        id = next(self._ids)
+        future = get_running_loop().create_future()
+        message = {"op": "acquire", "id": id, "method": method, "url": url}
+        self._pending[id] = (future, message)
+        try:
+            if not await self._connect():
+                self._send(message)
+            await future
+        except CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted, but the request is never going to be made.
+                self.cancel(method, url)
+            elif self._writer and not self._writer.is_closing():
+                self._released[id] = message
+                self._send({"op": "release", "id": id})
+            raise
+        finally:
+            self._pending.pop(id, None)
+
+    def update(self, method: str, url: str, headers):
+        self._send({"op": "update", "method": method, "url": url, "headers": {name: headers[name] for name in RATELIMIT_HEADERS if name in headers}})
+
+    def cancel(self, method: str, url: str):
+        self._send({"op": "cancel", "method": method, "url": url})
+
+    def ratelimited(self, method: str, url: str, retry_after: float, is_global: bool):
+        self._send({"op": "ratelimited", "method": method, "url": url, "retry_after": retry_after, "global": is_global})
+
+    def _send(self, message: dict):
+        # Updates for a coordinator that's gone are dropped, the new one learns from the next responses.
+        if self._writer and not self._writer.is_closing():
+            self._writer.write(dumps(message) + b"\n")
+
+    def _elect(self) -> bool:
+        if self._lock_fd is not None:
+            return True
+        fd = os.open(self.path + ".lock", os.O_CREAT | os.O_RDWR)
+        try:
+            flock(fd, LOCK_EX | LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        return True
+
+    async def _connect(self) -> bool:
+        """
+        Connects to the coordinator (starting it if nobody is) if we aren't already. Returns whether a new connection was made, which resends everything pending.
+        """
+        async with self._connecting:
+            if self._writer and not self._writer.is_closing():
+                return False
+
+            while True:
+                if not self.coordinator and self._elect():
+                    self.coordinator = RateLimitCoordinator(self.path, global_limit = self.global_limit)
+                    await self.coordinator.start()
+                    logger.debug(f"Coordinating rate limits at {self.path}.")
+                try:
+                    reader, self._writer = await open_unix_connection(self.path)
+                    break
+                except (FileNotFoundError, ConnectionRefusedError):
+                    # Either the coordinator is still starting, or it's gone and we'll try to take over.
+                    await sleep(0.05)
+
+            self._reader_task = get_running_loop().create_task(self._read(reader))
+            for _, message in self._pending.values():
+                self._send(message)
+            return True
+
+    async def _read(self, reader: StreamReader):
+        try:
+            while line := await reader.readline():
+                reply = loads(line)
+                released = self._released.pop(reply["id"], None)
+                if released and not reply.get("released"):
+                    # Granted before the release got there, hand it straight back so the bucket isn't held forever.
+                    self.cancel(released["method"], released["url"])
+                    continue
+                pending = self._pending.get(reply["id"])
+                if pending and not pending[0].done():
+                    pending[0].set_result(None)
+        except ConnectionError:
+            pass
+        self._writer = None
+        # A new coordinator starts with fresh buckets, there's nothing to give back to it.
+        self._released.clear()
+        if self._pending:
+            await self._connect()
+
+    async def close(self):
+        if self._reader_task:
+            self._reader_task.cancel()
+        if self._writer:
+            self._writer.close()
+        if self.coordinator:
+            await self.coordinator.close()
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
@@ -1,6 +1,8 @@
 from .partials import PartialEmoji
 
 class Reaction:
+    __slots__ = ("count", "me", "emoji")
+
     def __init__(self, data: dict):
         self.count: int = data.get("count")
         self.me: bool = data.get("me")
@@ -0,0 +1,68 @@
+from logging import getLogger
+from typing import Any, Callable, Dict, Optional
+
+logger = getLogger(__name__)
+
+
+class RawObject:
+    """
+    Stands in for an object whose type the library doesn't know yet, e.g. one Discord added after this version. It keeps the payload as it is, and gives it back unchanged when it's sent to Discord again.
+
+    Attributes:
+    -----------
+    type: Optional[int] The type code from the payload.
+    data: dict The payload.
+    """
+    __slots__ = ("type", "data")
+
+    def __init__(self, data: dict):
+        self.type: Optional[int] = data.get("type")
+        self.data: dict = data
+
+    def __repr__(self) -> str:
+        return f"<RawObject type={self.type!r}>"
+
+    def to_dict(self) -> dict:
+        return self.data
+
+
+class TypeRegistry:
+    """
+    Maps the type codes Discord sends to what parses them, so picking the class for a payload is a single dict lookup.
+
+    Anything not registered is handed to `fallback` instead, so a new type from Discord is parsed as something generic rather than breaking the request it came in. New types can be registered without changing the library, either by calling :meth:`register` or by using it as a class decorator:
+
+        @channel_registry.register(15)
+        class ForumChannel(GuildChannel):
+            ...
+
+    Attributes:
+    -----------
+    name: str What kind of objects the registry holds, used in logs.
+    fallback: Callable What parses types that aren't registered.
+
+    Methods:
+    --------
+    :meth:`register(type: int, parser: Optional[Callable] = None)` - Registers `parser` for `type`, replacing what was there.
+    :meth:`get(type: int)` - What parses `type`, or the fallback.
+    """
+    def __init__(self, name: str, *, fallback: Callable):
+        self.name: str = name
+        self.fallback: Callable = fallback
+        self.types: Dict[Any, Callable] = {}
+
+    def __contains__(self, type: Any) -> bool:
+        return type in self.types
+
+    def register(self, type: Any, parser: Optional[Callable] = None):
+        if parser is None:
+            return lambda parser: self.register(type, parser)
+        self.types[type] = parser
+        return parser
+
+    def get(self, type: Any) -> Callable:
+        parser = self.types.get(type)
+        if parser is None:
+            logger.debug(f"Unknown {self.name} type {type!r}, parsing it with {getattr(self.fallback, '__name__', self.fallback)}.")
+            return self.fallback
+        return parser
@@ -0,0 +1,87 @@
+from logging import getLogger
+from random import uniform
+from time import monotonic
+from typing import Optional, Tuple
+from .exceptions import CircuitOpen
+
+logger = getLogger(__name__)
+
+
+class RetryPolicy:
+    """
+    Decides whether HTTPClient retries a request that failed with a 5xx, a dropped connection or a timeout, and how long it waits first.
+
+    Attributes:
+    -----------
+    max_retries: int How many times a request is retried at most.
+    base_delay: float The delay before the first retry. It doubles with every retry, and a random amount up to it is waited ("full jitter") so clients don't retry in lockstep.
+    max_delay: float The longest a single delay can be.
+    deadline: float How long, from the first attempt, a request can keep being retried for.
+    retry_statuses: Tuple[int] The status codes that are retried.
+    retry_non_idempotent: bool Whether POST and PATCH requests are retried too. They're not by default, a request that timed out may still have gone through.
+    """
+    IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+    def __init__(self, *, max_retries: int = 3, base_delay: float = 0.5, max_delay: float = 10.0, deadline: float = 30.0, retry_statuses: Tuple[int] = (500, 502, 503, 504), retry_non_idempotent: bool = False):
+        self.max_retries: int = max_retries
+        self.base_delay: float = base_delay
+        self.max_delay: float = max_delay
+        self.deadline: float = deadline
+        self.retry_statuses: Tuple[int] = retry_statuses
+        self.retry_non_idempotent: bool = retry_non_idempotent
+
+    def delay(self, attempt: int) -> float:
+        return uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def should_retry(self, method: str, attempt: int, started_at: float, delay: float, status: Optional[int] = None) -> bool:
+        if status is not None and status not in self.retry_statuses:
+            return False
+        if method not in self.IDEMPOTENT_METHODS and not self.retry_non_idempotent:
+            return False
+        return attempt < self.max_retries and monotonic() + delay - started_at <= self.deadline
+
+
+class CircuitBreaker:
+    """
+    Stops requests to a route that keeps failing, so callers fail straight away instead of queueing up behind a dead upstream.
+
+    After `failure_threshold` failures in a row the breaker opens and requests raise :class:`CircuitOpen`. Once `recovery_time` has passed one request is let through to test the route ("half open"), if it succeeds the breaker closes again, otherwise it stays open for another `recovery_time`.
+
+    Attributes:
+    -----------
+    state: str One of "closed", "open" or "half open".
+    failures: int How many requests have failed in a row.
+    opened_at: Optional[float] When the breaker last opened, on the `time.monotonic` clock.
+    """
+    def __init__(self, route: str, *, failure_threshold: int = 5, recovery_time: float = 30.0):
+        self.route: str = route
+        self.failure_threshold: int = failure_threshold
+        self.recovery_time: float = recovery_time
+        self.state: str = "closed"
+        self.failures: int = 0
+        self.opened_at: Optional[float] = None
+
+    def check(self):
+        """
+        Raises :class:`CircuitOpen` if a request can't be made right now.
+        """
+        if self.state == "closed":
+            return
+        if monotonic() - self.opened_at >= self.recovery_time:
+            # Also covers a test request that never finished, another one is let through after a while.
+            self.state = "half open"
+            self.opened_at = monotonic()
+            return
+        raise CircuitOpen(f"{self.route} has failed {self.failures} times in a row, not trying again until {self.recovery_time}s after the last failure.")
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                logger.warning(f"Opening the circuit breaker for {self.route} after {self.failures} failures.")
+            self.state = "open"
+            self.opened_at = monotonic()
@@ -1,3 +1,16 @@
+from typing import Optional
+from .snowflake import Snowflake, snowflake
+
+class RoleTag:
+    __slots__ = ("bot_id", "integration_id", "premium_subscriber")
+
+    def __init__(self, data: dict):
+        self.bot_id: Optional[Snowflake] = snowflake(data.get("bot_id"))
+        self.integration_id: Optional[Snowflake] = snowflake(data.get("integration_id"))
+        self.premium_subscriber: Optional[bool] = data.get(
+            "premium_subscriber")
+
+
 class Role:
     """
     Represents a Role from Discord
@@ -7,4 +20,20 @@ class Role:
     id
         The id of the Role
     
-    """
\ No newline at end of file
+    """
+    __slots__ = ("data", "client", "id", "name", "color", "hoist", "icon", "unicode_emoji", "position", "permissions", "managed", "mentionable", "tags")
+
+    def __init__(self, client, data: dict):
+        self.data = data
+        self.client = client
+        self.id: Snowflake = snowflake(data.get("id"))
+        self.name: str = data.get("name")
+        self.color: int = data.get("color")
+        self.hoist: bool = data.get("hoist")
+        self.icon: Optional[str] = data.get("icon")
+        self.unicode_emoji: Optional[str] = data.get("unicode_emoji")
+        self.position: int = data.get("position")
+        self.permissions: str = data.get("permissions")  # TODO: Permissions
+        self.managed: bool = data.get("managed")
+        self.mentionable: bool = data.get("mentionable")
+        self.tags: Optional[RoleTag] = RoleTag(self.data.get("tags")) if self.data.get("tags") else None
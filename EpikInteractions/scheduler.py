@@ -0,0 +1,76 @@
+from asyncio import Future, get_running_loop
+from collections import deque
+from time import monotonic
+from typing import Deque, Dict, Tuple
+
+
+class Priority:
+    """
+    How urgent a request is. Lower goes first.
+
+    INTERACTION: Responding to an interaction, its token expires and the user is waiting on it.
+    DEFAULT: Ordinary requests.
+    BACKGROUND: Housekeeping nobody is waiting on, like bulk deletes and archive sweeps.
+    """
+    INTERACTION = 0
+    DEFAULT = 1
+    BACKGROUND = 2
+
+
+class PriorityScheduler:
+    """
+    Limits how many requests HTTPClient has in flight at once, and decides who goes next when they're all taken.
+
+    Waiting requests go in order of priority, but every `aging` seconds spent waiting counts as one level more urgent, so background work still gets through while the client is busy.
+
+    Attributes:
+    -----------
+    max_concurrency: int How many requests can be in flight at once.
+    aging: float How many seconds of waiting it takes to move up one priority.
+    in_flight: int How many requests are in flight right now.
+    """
+    def __init__(self, *, max_concurrency: int = 50, aging: float = 2.0):
+        self.max_concurrency: int = max_concurrency
+        self.aging: float = aging
+        self.in_flight: int = 0
+        self._waiting: Dict[int, Deque[Tuple[float, Future]]] = {}
+
+    def waiting(self) -> Dict[int, int]:
+        """
+        How many requests are waiting, by priority.
+        """
+        return {priority: len(queue) for priority, queue in self._waiting.items()}
+
+    async def acquire(self, priority: int = Priority.DEFAULT):
+        if self.in_flight < self.max_concurrency and not any(self._waiting.values()):
+            self.in_flight += 1
+            return
+
+        future = get_running_loop().create_future()
+        queue = self._waiting.setdefault(priority, deque())
+        entry = (monotonic(), future)
+        queue.append(entry)
+        try:
+            await future
+        except BaseException:
+            if future.done() and not future.cancelled():
+                # We were handed the slot just as we were cancelled, pass it on.
+                self.release()
+            else:
+                queue.remove(entry)
+            raise
+
+    def release(self):
+        now = monotonic()
+        best = None
+        for priority, queue in self._waiting.items():
+            if queue:
+                urgency = priority - (now - queue[0][0]) / self.aging
+                if best is None or urgency < best[0]:
+                    best = (urgency, queue)
+
+        if best:
+            # The slot goes straight to the next request, so in_flight doesn't change.
+            best[1].popleft()[1].set_result(None)
+        else:
+            self.in_flight -= 1
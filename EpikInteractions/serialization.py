@@ -0,0 +1,76 @@
+from typing import Any, Optional
+from .codec import dumps, fragment
+
+_CACHE_SLOTS = frozenset(("_dict", "_parts", "_encoded", "_frozen"))
+
+
+class Serializable:
+    """
+    A builder (embed, component, command option...) that keeps what `to_dict` built, so sending the same one again doesn't rebuild it.
+
+    Subclasses build their payload in `_to_dict`. Setting any attribute throws the cached payload away, so the setter methods and plain assignments both work, but changing a list or dict the builder holds in place doesn't, call :meth:`invalidate` after doing that. Builders holding other builders, like action rows, list them in `_children`, and are rebuilt whenever one of those changed. The dict `to_dict` returns is shared between sends and shouldn't be changed.
+
+    Methods:
+    --------
+    :meth:`to_dict()` - The payload, built the first time and cached.
+    :meth:`to_json()` - The payload encoded to JSON, encoded the first time and cached.
+    :meth:`freeze()` - Encodes the payload now and makes :meth:`serialize` hand out the encoded bytes, for builders that are sent over and over. Frozen builders don't check the builders they hold for changes, call :meth:`invalidate` after changing one.
+    :meth:`serialize()` - What goes into a request: the encoded bytes if the builder is frozen and the JSON backend can splice them in, the dict otherwise.
+    :meth:`invalidate()` - Throws the cached payload away.
+    """
+    __slots__ = ("_dict", "_parts", "_encoded", "_frozen")
+
+    # Overridden by builders that contain other builders, returns them.
+    _children = None
+
+    def __setattr__(self, name: str, value: Any):
+        object.__setattr__(self, name, value)
+        if name not in _CACHE_SLOTS:
+            self.invalidate()
+
+    def invalidate(self):
+        object.__setattr__(self, "_dict", None)
+        object.__setattr__(self, "_parts", None)
+        object.__setattr__(self, "_encoded", None)
+
+    def _to_dict(self) -> dict:
+        raise NotImplementedError
+
+    def to_dict(self) -> dict:
+        if self._children is not None:
+            # The children cache their own payloads, so it's only rebuilt if one of them was.
+            parts = tuple(child.to_dict() if hasattr(child, "to_dict") else child for child in self._children())
+            if parts != self._parts:
+                self.invalidate()
+                object.__setattr__(self, "_parts", parts)
+
+        if self._dict is None:
+            object.__setattr__(self, "_dict", self._to_dict())
+        return self._dict
+
+    def to_json(self) -> bytes:
+        data = self.to_dict()
+        if self._encoded is None:
+            object.__setattr__(self, "_encoded", dumps(data))
+        return self._encoded
+
+    def freeze(self):
+        object.__setattr__(self, "_frozen", True)
+        self.to_json()
+        return self
+
+    def serialize(self) -> Any:
+        if not getattr(self, "_frozen", False):
+            return self.to_dict()
+        if fragment is not None:
+            return fragment(self._encoded if self._encoded is not None else self.to_json())
+        return self._dict if self._dict is not None else self.to_dict()
+
+
+def serialize(obj: Optional[Any]) -> Any:
+    """
+    What goes into a request for a builder, or for anything else with a `to_dict`. Dicts are passed through.
+    """
+    if isinstance(obj, Serializable):
+        return obj.serialize()
+    return obj.to_dict() if hasattr(obj, "to_dict") else obj
@@ -0,0 +1,99 @@
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional, Tuple, Union
+
+DISCORD_EPOCH = 1420070400000
+
+
+class Snowflake(int):
+    """
+    A Discord id. It's an int, so it hashes and compares cheaply and can be used wherever an int can, and its parts can be read without parsing it again.
+
+    It's still written as its digits in URLs and f-strings, `to_dict` methods turn it back into a string for Discord.
+
+    Attributes:
+    -----------
+    timestamp: float When it was created, as a Unix timestamp in seconds.
+    created_at: datetime When it was created, in UTC.
+    worker_id: int The internal worker that made it.
+    process_id: int The internal process that made it.
+    increment: int How many ids that process had made that millisecond.
+    """
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return f"Snowflake({int(self)})"
+
+    # int has no __str__ of its own, it falls back to __repr__, which would put the above in URLs.
+    __str__ = int.__repr__
+
+    @classmethod
+    def from_timestamp(cls, timestamp: float) -> "Snowflake":
+        """
+        The lowest snowflake created at `timestamp` (Unix seconds), any id created at or after it is greater than or equal to it.
+        """
+        return cls((int(timestamp * 1000) - DISCORD_EPOCH) << 22)
+
+    @property
+    def timestamp(self) -> float:
+        return ((self >> 22) + DISCORD_EPOCH) / 1000
+
+    @property
+    def created_at(self) -> datetime:
+        return datetime.fromtimestamp(self.timestamp, tz = timezone.utc)
+
+    @property
+    def worker_id(self) -> int:
+        return (self >> 17) & 0x1F
+
+    @property
+    def process_id(self) -> int:
+        return (self >> 12) & 0x1F
+
+    @property
+    def increment(self) -> int:
+        return self & 0xFFF
+
+
+def snowflake(value: Optional[Union[str, int]]) -> Optional[Snowflake]:
+    """
+    Turns an id from a payload into a :class:`Snowflake`, passing None through for fields that can be missing.
+    """
+    return Snowflake(value) if value is not None else None
+
+
+def snowflake_time(snowflake: Union[str, int]) -> float:
+    """
+    When a snowflake was created, as a Unix timestamp in seconds.
+    """
+    return ((int(snowflake) >> 22) + DISCORD_EPOCH) / 1000
+
+
+def snowflake_times(ids: Iterable[Union[str, int]]) -> List[float]:
+    """
+    When each of `ids` was created, as Unix timestamps in seconds. Skips building a Snowflake for each, for long lists like a page of history.
+    """
+    return [((int(id) >> 22) + DISCORD_EPOCH) / 1000 for id in ids]
+
+
+class Snowflakes:
+    """
+    A list of ids on a slotted model that's only turned into Snowflakes when it's read.
+
+    Models keep the list from the payload in the slot named after the attribute with a leading underscore, the first read converts it to a tuple of :class:`Snowflake` and stores that back in its place. Like :class:`Timestamp`, a model whose ids are never read never converts them, and the payload's strings aren't copied until then.
+    """
+    __slots__ = ("slot",)
+
+    def __set_name__(self, owner, name: str):
+        self.slot: str = f"_{name}"
+
+    def __get__(self, instance, owner = None) -> Tuple[Snowflake, ...]:
+        if instance is None:
+            return self
+        value = getattr(instance, self.slot)
+        if value.__class__ is not tuple:
+            value = tuple(Snowflake(id) for id in value) if value else ()
+            setattr(instance, self.slot, value)
+        return value
+
+    def __set__(self, instance, value: Optional[Iterable[Union[str, int]]]):
+        setattr(instance, self.slot, value)
@@ -1,16 +1,22 @@
+from .snowflake import Snowflake, snowflake
+
 class StickerItem:
+    __slots__ = ("id", "name", "format_type")
+
     def __init__(self, data : dict):
-        self.id: str = data.get("id")
+        self.id: Snowflake = snowflake(data.get("id"))
         self.name: str = data.get("name")
         self.format_type: int = data.get("format_type")
 
 class Sticker:
+    __slots__ = ("id", "name", "description", "tags", "type", "format_type", "pack_id", "sort_value")
+
     def __init__(self, data: dict):
-        self.id: str = data.get("id")
+        self.id: Snowflake = snowflake(data.get("id"))
         self.name: str = data.get("name")
         self.description: str = data.get("description")
         self.tags: str = data.get("tags")
         self.type: str = data.get("image")
         self.format_type: int = data.get("format_type")
-        self.pack_id: int = data.get("pack_id")
+        self.pack_id: Snowflake = snowflake(data.get("pack_id"))
         self.sort_value: int = data.get("sort_value")
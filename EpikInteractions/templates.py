@@ -0,0 +1,79 @@
+import re
+from typing import Any, Callable, Dict, List, Optional, Union
+from .codec import dumps
+from .exceptions import InvalidTemplate
+from .interactions import BaseInteraction, message_payload
+
+MAX_CONTENT_LENGTH = 2000
+MAX_EMBEDS = 10
+MAX_ACTION_ROWS = 5
+
+
+class ResponseTemplate:
+    """
+    A reply that's the same every time, checked and encoded to JSON once when it's made, so responding with it only costs copying bytes.
+
+    Its text can have slots, `{name}` placeholders that are filled for each request with `slots[name](interaction)`. Only the names in `slots` are placeholders, other braces are left alone. The values are escaped and spliced into the encoded bytes, the payload isn't encoded again.
+
+    Register it with :meth:`Interface.add_template`, or use it anywhere a callback goes (as a subcommand's callback, for example). The endpoint answers with it directly, without starting a callback.
+
+        rules = ResponseTemplate(embeds = [rules_embed])
+        welcome = ResponseTemplate("Welcome {user}!", slots = {"user": lambda interaction: interaction.member.user.username})
+
+    Attributes:
+    -----------
+    payload: dict The response, as it's sent.
+    body: bytes `payload` encoded, with the placeholders still in it.
+    slots: Dict[str, Callable[[BaseInteraction], Any]] What fills each slot.
+
+    Methods:
+    --------
+    :meth:`render(interaction)` - The response body for `interaction`, with its slots filled.
+    """
+    __slots__ = ("payload", "body", "slots", "_segments", "_fills")
+
+    def __init__(self, content: Optional[str] = None, *, embeds: Optional[list] = None, components: Optional[list] = None, tts: Optional[bool] = False, allowed_mentions = None, ephemeral: Optional[bool] = False, slots: Optional[Dict[str, Callable[[BaseInteraction], Any]]] = None):
+        self.payload: dict = {"type": 4, "data": message_payload(content, embeds = [_to_dict(embed) for embed in embeds or []], components = [_to_dict(component) for component in components or []], tts = tts, allowed_mentions = allowed_mentions, ephemeral = ephemeral)}
+        self.slots: Dict[str, Callable[[BaseInteraction], Any]] = slots or {}
+        self._validate(self.payload["data"])
+        self.body: bytes = dumps(self.payload)
+
+        self._segments: List[bytes] = [self.body]
+        self._fills: List[tuple] = []
+        if self.slots:
+            # Splitting on a group keeps the slot names, at every odd index.
+            pattern = re.compile(rb"\{(" + b"|".join(re.escape(name.encode()) for name in self.slots) + rb")\}")
+            self._segments = pattern.split(self.body)
+            self._fills = [(index, self._segments[index].decode()) for index in range(1, len(self._segments), 2)]
+            missing = set(self.slots) - {name for _, name in self._fills}
+            if missing:
+                raise InvalidTemplate(f"The slots {', '.join(sorted(missing))} don't appear in the template.")
+
+    def _validate(self, data: dict):
+        if len(data.get("content") or "") > MAX_CONTENT_LENGTH:
+            raise InvalidTemplate(f"The content can't be more than {MAX_CONTENT_LENGTH} characters.")
+        if len(data.get("embeds") or []) > MAX_EMBEDS:
+            raise InvalidTemplate(f"A message can't have more than {MAX_EMBEDS} embeds.")
+        if len(data.get("components") or []) > MAX_ACTION_ROWS:
+            raise InvalidTemplate(f"A message can't have more than {MAX_ACTION_ROWS} action rows.")
+        if not (data.get("content") or data.get("embeds") or data.get("components")):
+            raise InvalidTemplate("A template needs content, embeds or components.")
+
+    def render(self, interaction: BaseInteraction) -> bytes:
+        if not self._fills:
+            return self.body
+
+        # Encoding each value as a JSON string escapes it, the quotes around it are dropped since the placeholder is already inside one.
+        values = {name: dumps(str(fill(interaction)))[1:-1] for name, fill in self.slots.items()}
+        segments = self._segments.copy()
+        for index, name in self._fills:
+            segments[index] = values[name]
+        return b"".join(segments)
+
+    async def __call__(self, interaction: BaseInteraction):
+        interaction.respond(self.render(interaction))
+
+
+def _to_dict(obj: Union[dict, Any]) -> dict:
+    # Encoded once, so there's nothing to gain from spliced fragments.
+    return obj.to_dict() if hasattr(obj, "to_dict") else obj
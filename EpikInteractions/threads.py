@@ -1,23 +1,41 @@
 from .exceptions import *
+from .messageable import GuildMessageable
 from typing import List, Optional
+from .snowflake import Snowflake, snowflake
+from .timestamps import Timestamp
+from datetime import datetime
 
 class ThreadMember:
+    __slots__ = ("id", "thread_id", "_join_timestamp", "flags")
+
+    join_timestamp: Optional[datetime] = Timestamp()
+
     def __init__(self, data: dict):
-        self.id: str = data.get("user_id")
-        self.thread_id: str = data.get("thread_id")
-        self.join_timestamp: str = data.get("join_timestamp")
+        self.id: Snowflake = snowflake(data.get("user_id"))
+        self.thread_id: Snowflake = snowflake(data.get("thread_id"))
+        self._join_timestamp: str = data.get("join_timestamp")
         self.flags: int = data.get("flags")
 
-class Thread:
+class Thread(GuildMessageable):
+    __slots__ = ("id", "client", "type", "guild_id", "parent_id", "name", "owner_id", "message_count", "member_count", "archived", "auto_archive_duration", "_archive_timestamp", "locked")
+
+    archive_timestamp: Optional[datetime] = Timestamp()
+
     def __init__(self, client, data: dict):
-        super().__init__(client, data)
-        self.owner_id: str = data.get("owner_id")
+        super().__init__(client, data["id"])
+        self.type: int = data.get("type")
+        self.guild_id: Snowflake = snowflake(data.get("guild_id"))
+        self.parent_id: Snowflake = snowflake(data.get("parent_id"))
+        self.name: str = data.get("name")
+        self.owner_id: Snowflake = snowflake(data.get("owner_id"))
         self.message_count: int = data.get("message_count")
         self.member_count: int = data.get("member_count")
-        self.archived: bool = data.get("archived")
-        self.auto_archive_duration: int = data.get("auto_archive_duration")
-        self.archive_timestamp: str = data.get("archive_timestamp")
-        self.locked: bool = data.get("locked")
+        # Discord nests these under thread_metadata.
+        metadata = data.get("thread_metadata", data)
+        self.archived: bool = metadata.get("archived")
+        self.auto_archive_duration: int = metadata.get("auto_archive_duration")
+        self._archive_timestamp: str = metadata.get("archive_timestamp")
+        self.locked: bool = metadata.get("locked")
 
     async def join(self):
         if self.archived:
@@ -60,14 +78,5 @@ class Thread:
         response = await self.client.http.get(f"/channels/{self.id}/thread-members")
         return [ThreadMember(member) for member in await response.json()]
 
-    async def bulk_delete(self, message_ids: List[str], reason: Optional[str]) -> None:
-
-        if reason:
-            headers = self.client.http.headers.copy()
-            headers["X-Audit-Log-Reason"] = reason
-
-        response = await self.client.http.post(f"channels/{self.id}/messages/bulk-delete", data={"messages": message_ids}, headers=headers)
-        return await response.json()
-
 class PrivateThread(Thread):
-    ...
\ No newline at end of file
+    __slots__ = ()
\ No newline at end of file
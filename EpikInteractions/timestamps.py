@@ -0,0 +1,55 @@
+import re
+from datetime import datetime, timezone
+from typing import Optional, Union
+
+# Everything fromisoformat doesn't take before 3.11: a trailing Z, and fractions that aren't 3 or 6 digits long.
+_ISO_8601 = re.compile(r"(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2})(?:\.(\d+))?(Z|[+-]\d{2}:?\d{2})?$")
+
+
+def parse_timestamp(value: Optional[Union[str, datetime]]) -> Optional[datetime]:
+    """
+    Parses an ISO-8601 timestamp from a payload into an aware datetime. Discord sends them with a Z or with an offset, and with or without microseconds, timestamps without an offset are taken to be in UTC.
+    """
+    if value is None or isinstance(value, datetime):
+        return value
+
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        match = _ISO_8601.match(value)
+        if not match:
+            raise
+        base, fraction, offset = match.groups()
+        if fraction:
+            base += "." + fraction[:6].ljust(6, "0")
+        if offset == "Z":
+            offset = "+00:00"
+        elif offset and ":" not in offset:
+            offset = offset[:3] + ":" + offset[3:]
+        parsed = datetime.fromisoformat(base + (offset or ""))
+
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo = timezone.utc)
+
+
+class Timestamp:
+    """
+    A timestamp attribute on a slotted model that's only parsed when it's read.
+
+    Models keep the string from the payload in the slot named after the attribute with a leading underscore, the first read parses it with :func:`parse_timestamp` and stores the datetime back in its place. A model whose timestamps are never read never parses them.
+    """
+    __slots__ = ("slot",)
+
+    def __set_name__(self, owner, name: str):
+        self.slot: str = f"_{name}"
+
+    def __get__(self, instance, owner = None) -> Optional[datetime]:
+        if instance is None:
+            return self
+        value = getattr(instance, self.slot)
+        if value.__class__ is str:
+            value = parse_timestamp(value)
+            setattr(instance, self.slot, value)
+        return value
+
+    def __set__(self, instance, value: Optional[Union[str, datetime]]):
+        setattr(instance, self.slot, value)
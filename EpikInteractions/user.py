@@ -1,12 +1,14 @@
 from typing import Optional
-from .channels import Messageable
+from .messageable import Messageable
+from .snowflake import Snowflake, snowflake
 
 class User(Messageable):
+    __slots__ = ("data", "client", "id", "username", "discriminator", "avatar", "bot", "system", "mfa_enabled", "banner", "accent_color", "locale", "verified", "email", "flags", "premium_type", "public_flags")
+
     def __init__(self, client, data: dict):
+        # Messageable sets the id and client.
         super().__init__(client, data["id"])
         self.data = data
-        self.client = client
-        self.id: str = data.get("id")
         self.username: str = data.get("username")
         self.discriminator: str = data.get("discriminator")
         self.avatar: Optional[str] = data.get("avatar")
@@ -24,7 +26,9 @@ class User(Messageable):
         self.public_flags: int = data.get("public_flags")
 
 class WebhookUser:
+    __slots__ = ("webhook_id", "username", "avatar")
+
     def __init__(self, data: dict):
-        self.webhook_id: str = data.get("webhook_id")
+        self.webhook_id: Snowflake = snowflake(data.get("webhook_id"))
         self.username: str = data.get("username")
         self.avatar: str = data.get("avatar")
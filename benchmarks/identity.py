@@ -0,0 +1,82 @@
+"""
+Measures what the per-request identity map saves on a message context command, where the same few users show up over and over: as the invoker, in resolved users and members, and as the author and mentions of the target message and the message it replies to.
+
+Every user and member the payload references is accessed, with and without an IdentityMap for the request.
+
+Run it from the root of the repository with `python -m benchmarks.identity`.
+"""
+import asyncio
+import tracemalloc
+from time import perf_counter
+from EpikInteractions.identity import IdentityMap, current_identity_map
+from EpikInteractions.interactions import ApplicationCommandInteraction
+from benchmarks.interactions import user, member, message
+
+USERS = [user(str(937364424208040000 + i), f"user{i}") for i in range(10)]
+INVOKER = USERS[0]
+
+
+def reply_chain(id: int, depth: int) -> dict:
+    data = message(str(id), USERS[depth % len(USERS)], USERS)
+    if depth:
+        data["referenced_message"] = reply_chain(id + 1, depth - 1)
+    return data
+
+
+TARGET = reply_chain(937364424208041000, 5)
+
+PAYLOAD = {
+    "id": "937364424208039961",
+    "application_id": "937364424208039962",
+    "type": 2,
+    "guild_id": "937364424208039957",
+    "channel_id": "937364424208039960",
+    "member": member(INVOKER["id"], INVOKER["username"]),
+    "token": "a" * 180,
+    "version": 1,
+    "data": {
+        "id": "937364424208039964",
+        "name": "Quote",
+        "type": 3,
+        "target_id": TARGET["id"],
+        "resolved": {
+            "users": {data["id"]: data for data in USERS},
+            "members": {data["id"]: {k: v for k, v in member(data["id"], data["username"]).items() if k != "user"} for data in USERS},
+            "messages": {TARGET["id"]: TARGET},
+        },
+    },
+}
+
+
+def parse():
+    interaction = ApplicationCommandInteraction(None, PAYLOAD, {})
+    interaction.member
+    interaction.resolved.users, interaction.resolved.members, interaction.resolved.messages
+
+
+def shared():
+    token = current_identity_map.set(IdentityMap())
+    try:
+        parse()
+    finally:
+        current_identity_map.reset(token)
+
+
+async def main():
+    number = 2000
+    for name, func in (("without", parse), ("with", shared)):
+        start = perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = perf_counter() - start
+
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"{name:>7} an identity map: {elapsed / number * 1e6:.1f}us and {peak} bytes allocated per interaction")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
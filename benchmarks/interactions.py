@@ -0,0 +1,100 @@
+"""
+Measures how much it costs to build an interaction from a realistic payload.
+
+lazy: build the interaction and read what a typical callback reads, one option and the resolved user it points at.
+eager: build the interaction and touch every sub-object, which is what the constructors used to do up front.
+
+Run it from the root of the repository with `python -m benchmarks.interactions`.
+"""
+import asyncio
+import tracemalloc
+from time import perf_counter
+from EpikInteractions.interactions import ApplicationCommandInteraction
+
+
+def user(id: str, name: str) -> dict:
+    return {"id": id, "username": name, "discriminator": "0001", "avatar": "a" * 32, "public_flags": 0}
+
+
+def member(id: str, name: str) -> dict:
+    return {"user": user(id, name), "roles": ["937364424208039958", "937364424208039959"], "joined_at": "2022-02-01T12:00:00.000000Z", "premium_since": None, "deaf": False, "mute": False, "pending": False, "permissions": "2199023255551"}
+
+
+def message(id: str, author: dict, mentions: list) -> dict:
+    return {
+        "id": id,
+        "channel_id": "937364424208039960",
+        "guild_id": "937364424208039957",
+        "author": author,
+        "content": "hello " * 20,
+        "timestamp": "2022-04-01T12:00:00.000000+00:00",
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": mentions,
+        "mention_roles": [],
+        "embeds": [{"title": "An embed", "description": "Some text " * 10}],
+        "reactions": [{"count": 2, "me": False, "emoji": {"id": None, "name": "\N{THUMBS UP SIGN}"}}],
+        "pinned": False,
+        "type": 0,
+    }
+
+
+USERS = {str(937364424208040000 + i): user(str(937364424208040000 + i), f"user{i}") for i in range(10)}
+
+PAYLOAD = {
+    "id": "937364424208039961",
+    "application_id": "937364424208039962",
+    "type": 2,
+    "guild_id": "937364424208039957",
+    "channel_id": "937364424208039960",
+    "member": member("937364424208039963", "invoker"),
+    "token": "a" * 180,
+    "version": 1,
+    "locale": "en-GB",
+    "guild_locale": "en-US",
+    "data": {
+        "id": "937364424208039964",
+        "name": "info",
+        "type": 1,
+        "options": [{"name": "user", "type": 6, "value": "937364424208040000"}],
+        "resolved": {
+            "users": USERS,
+            "members": {id: {k: v for k, v in member(id, data["username"]).items() if k != "user"} for id, data in USERS.items()},
+            "roles": {"937364424208039958": {"id": "937364424208039958", "name": "Moderator", "color": 0, "hoist": True, "position": 1, "permissions": "8", "managed": False, "mentionable": True}},
+            "messages": {"937364424208039965": message("937364424208039965", USERS["937364424208040001"], list(USERS.values())[:5])},
+        },
+    },
+}
+
+
+def lazy():
+    interaction = ApplicationCommandInteraction(None, PAYLOAD, {})
+    interaction.resolved.get_user(interaction.get_option("user"))
+
+
+def eager():
+    interaction = ApplicationCommandInteraction(None, PAYLOAD, {})
+    interaction.member, interaction.user, interaction.message
+    resolved = interaction.resolved
+    resolved.users, resolved.members, resolved.roles, resolved.messages, resolved.attachments
+
+
+async def main():
+    number = 5000
+    for name, func in (("eager", eager), ("lazy", lazy)):
+        start = perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = perf_counter() - start
+
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"{name:>5}: {elapsed / number * 1e6:.1f}us and {peak} bytes allocated per interaction")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
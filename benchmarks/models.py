@@ -0,0 +1,67 @@
+"""
+Measures how much memory parsed models keep alive, e.g. in a cache of members or messages.
+
+Every payload is parsed `number` times and the results are kept, the memory still allocated afterwards is divided by `number`. The payloads themselves aren't counted, only what parsing them adds.
+
+Run it from the root of the repository with `python -m benchmarks.models`.
+"""
+import gc
+import tracemalloc
+from EpikInteractions.member import Member
+from EpikInteractions.message import Message
+from EpikInteractions.user import User
+
+
+def user(id: int) -> dict:
+    return {"id": str(id), "username": f"user{id}", "discriminator": "0001", "avatar": "a" * 32, "public_flags": 0}
+
+
+def member(id: int) -> dict:
+    return {"user": user(id), "nick": None, "roles": ["937364424208039958", "937364424208039959"], "joined_at": "2022-02-01T12:00:00.000000Z", "premium_since": None, "deaf": False, "mute": False, "pending": False}
+
+
+def message(id: int) -> dict:
+    return {
+        "id": str(id),
+        "channel_id": "937364424208039960",
+        "guild_id": "937364424208039957",
+        "author": user(id + 1),
+        "content": "hello",
+        "timestamp": "2022-04-01T12:00:00.000000+00:00",
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [user(id + 2)],
+        "mention_roles": [],
+        "embeds": [{"title": "An embed", "description": "Some text"}],
+        "reactions": [{"count": 2, "me": False, "emoji": {"id": None, "name": "\N{THUMBS UP SIGN}"}}],
+        "pinned": False,
+        "type": 0,
+    }
+
+
+def measure(parse, payloads: list) -> float:
+    gc.collect()
+    tracemalloc.start()
+    parsed = [parse(payload) for payload in payloads]
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # The list holding them isn't part of any model.
+    return (current - parsed.__sizeof__()) / len(payloads)
+
+
+def main():
+    number = 10000
+    base = 937364424208040000
+    for name, parse, payload in (
+        ("User", lambda data: User(None, data), user),
+        ("Member", lambda data: Member(None, data), member),
+        ("Message", lambda data: Message(None, data), message),
+    ):
+        payloads = [payload(base + i * 3) for i in range(number)]
+        print(f"{name:>7}: {measure(parse, payloads):.0f} bytes per parsed object")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Several processes hammering a mock API, to check they stay under the global rate limit together.
+
+Each process makes requests to its own channels so only the global limit applies. With the in-process RateLimiter every process allows itself the whole limit, with the SharedRateLimiter they share it.
+
+Run it from the root of the repository with `python -m benchmarks.ratelimit_processes`.
+"""
+import asyncio
+import os
+import tempfile
+from collections import Counter
+from multiprocessing import Process, Queue
+from time import monotonic
+from aiohttp import web
+from EpikInteractions.interface import HTTPClient
+from EpikInteractions.ratelimit import RateLimiter, SharedRateLimiter
+
+PROCESSES = 4
+REQUESTS = 100
+GLOBAL_LIMIT = 50
+PORT = 8765
+
+
+def worker(index: int, shared: bool, path: str):
+    async def main():
+        ratelimiter = SharedRateLimiter(path, global_limit = GLOBAL_LIMIT) if shared else RateLimiter(global_limit = GLOBAL_LIMIT)
+        http = HTTPClient(ratelimiter = ratelimiter)
+        http.base_uri = f"http://127.0.0.1:{PORT}"
+        await asyncio.gather(*[http.get(f"channels/{index}{i}/messages") for i in range(REQUESTS)])
+        await http.close()
+    asyncio.run(main())
+
+
+async def run(shared: bool) -> int:
+    seconds = Counter()
+    start = monotonic()
+
+    async def handler(request):
+        seconds[int(monotonic() - start)] += 1
+        return web.json_response([])
+
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", PORT).start()
+
+    path = os.path.join(tempfile.mkdtemp(), "ratelimit.sock")
+    processes = [Process(target = worker, args = (index, shared, path)) for index in range(PROCESSES)]
+    for process in processes:
+        process.start()
+    while any(process.is_alive() for process in processes):
+        await asyncio.sleep(0.1)
+
+    await runner.cleanup()
+    return max(seconds.values())
+
+
+if __name__ == "__main__":
+    for shared in (False, True):
+        busiest = asyncio.run(run(shared))
+        print(f"{'SharedRateLimiter' if shared else 'RateLimiter':>17}: at most {busiest} requests in one second from {PROCESSES} processes (limit {GLOBAL_LIMIT})")
@@ -0,0 +1,56 @@
+"""
+Measures what re-sending the same builders costs: a select menu with 25 options in an action row, and an embed with 25 fields.
+
+Each send builds the message payload and encodes it, like a response or followup does. "rebuilt" throws every cached payload away before each send, which is what every send used to cost. "cached" reuses what `to_dict` built, "frozen" also reuses the encoded JSON where the JSON backend can splice it in.
+
+Run it from the root of the repository with `python -m benchmarks.serialization`.
+"""
+from time import perf_counter
+from EpikInteractions.codec import backend, dumps, fragment
+from EpikInteractions.components import MessageActionRow, MessageSelectMenu, MessageSelectMenuOption
+from EpikInteractions.embed import Embed
+from EpikInteractions.interactions import message_payload
+
+
+def select_menu() -> MessageActionRow:
+    menu = MessageSelectMenu(custom_id = "help", max_values = 5)
+    menu.set_placeholder("Pick a topic")
+    menu.add_options([MessageSelectMenuOption(f"Topic {i}", f"topic-{i}", description = f"Everything about topic {i}") for i in range(25)])
+    return MessageActionRow([menu])
+
+
+def embed() -> Embed:
+    embed = Embed(title = "Help", description = "Every command there is.", fields = [])
+    embed.set_footer(text = "Page 1 of 1")
+    for i in range(25):
+        embed.add_field(name = f"/command{i}", value = f"Does thing number {i}, with a reasonably long explanation of how.", inline = True)
+    return embed
+
+
+def rebuild(builder):
+    builder.invalidate()
+    for child in builder._children() if builder._children is not None else ():
+        rebuild(child)
+
+
+def main():
+    number = 20000
+    print(f"JSON backend: {backend}, splicing encoded JSON: {'yes' if fragment else 'no'}")
+    for name, make, send in (
+        ("select menu", select_menu, lambda row: dumps(message_payload(components = [row]))),
+        ("embed", embed, lambda embed: dumps(message_payload(embeds = [embed]))),
+    ):
+        for mode in ("rebuilt", "cached", "frozen"):
+            builder = make()
+            if mode == "frozen":
+                builder.freeze()
+            start = perf_counter()
+            for _ in range(number):
+                if mode == "rebuilt":
+                    rebuild(builder)
+                send(builder)
+            print(f"{name:>11}, {mode:>7}: {(perf_counter() - start) / number * 1e6:.2f}us per send")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Measures what answering a command with a fixed reply costs: a callback replying with an embed and a button row, against a ResponseTemplate of the same reply, with and without a slot.
+
+Interactions are dispatched directly, signature checks and parsing the request are the same either way and aren't counted.
+
+Run it from the root of the repository with `python -m benchmarks.templates`.
+"""
+import asyncio
+from time import perf_counter
+from nacl.signing import SigningKey
+from EpikInteractions.components import MessageActionRow, MessageButton
+from EpikInteractions.embed import Embed
+from EpikInteractions.interactions import ApplicationCommandInteraction
+from EpikInteractions.interface import Interface
+from EpikInteractions.templates import ResponseTemplate
+from benchmarks.interactions import PAYLOAD
+
+
+def reply() -> dict:
+    embed = Embed(title = "Rules", description = "Read these before posting.", fields = [])
+    for i in range(10):
+        embed.add_field(name = f"Rule {i}", value = f"An explanation of rule {i}, long enough to read like one.")
+    row = MessageActionRow([MessageButton(custom_id = "accept", label = "I accept"), MessageButton(url = "https://example.com/rules", custom_id = None, label = "Full rules")])
+    return {"embeds": [embed], "components": [row]}
+
+
+async def main():
+    number = 5000
+    client = Interface(public_key = SigningKey.generate().verify_key.encode().hex())
+    payload = reply()
+
+    async def callback(interaction):
+        await interaction.reply(**payload)
+
+    client.command(name = "callback", description = "A callback")(callback)
+    client.add_template(ResponseTemplate(**payload), name = "template")
+    payload["embeds"][0].set_title("Rules for {user}")
+    client.add_template(ResponseTemplate(**payload, slots = {"user": lambda interaction: interaction.member.user.username}), name = "slotted")
+
+    for name in ("callback", "template", "slotted"):
+        data = {**PAYLOAD, "data": {**PAYLOAD["data"], "name": name}}
+        start = perf_counter()
+        for _ in range(number):
+            await client._dispatch(ApplicationCommandInteraction(client, data, {}))
+        print(f"{name:>8}: {(perf_counter() - start) / number * 1e6:.1f}us per response")
+
+    await client.http.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
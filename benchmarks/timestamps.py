@@ -0,0 +1,37 @@
+"""
+Measures what parsing timestamps costs when building members, the way resolved members and the invoker are built for every command.
+
+Members are parsed from payloads and either left alone, or have their `joined_at` read. The old strptime call every member made is timed on its own for comparison.
+
+Run it from the root of the repository with `python -m benchmarks.timestamps`.
+"""
+from datetime import datetime
+from time import perf_counter
+from EpikInteractions.member import Member
+from EpikInteractions.timestamps import parse_timestamp
+from benchmarks.models import member
+
+
+def timed(func, payloads: list) -> float:
+    start = perf_counter()
+    for payload in payloads:
+        func(payload)
+    return (perf_counter() - start) / len(payloads) * 1e6
+
+
+def main():
+    number = 20000
+    payloads = [member(937364424208040000 + i) for i in range(number)]
+    stamps = [payload["joined_at"] for payload in payloads]
+
+    for name, func, items in (
+        ("strptime", lambda value: datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%fZ"), stamps),
+        ("parse_timestamp", parse_timestamp, stamps),
+        ("Member", lambda data: Member(None, data), payloads),
+        ("Member + joined_at", lambda data: Member(None, data).joined_at, payloads),
+    ):
+        print(f"{name:>18}: {timed(func, items):.2f}us each")
+
+
+if __name__ == "__main__":
+    main()
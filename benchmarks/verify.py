@@ -0,0 +1,77 @@
+"""
+Compares the per-request cost of verifying an interaction signature, and what verifying on the event loop does to everything else running on it.
+
+before: what `process_commands` used to do, build the VerifyKey and re-encode the body on every request.
+after: the cached VerifyKey from `Interface.__init__` checking the raw request bytes.
+
+The second part verifies bursts of concurrent requests with `Interface.verify_request`, on the loop and with `verify_in_thread`, while a task that should wake up every millisecond measures how late it is. That lateness is the latency every other request on the loop sees while signatures are checked. The thread pool can only help with a core to spare, on a single core it's no better than verifying on the loop.
+
+Run it from the root of the repository with `python -m benchmarks.verify`.
+"""
+import asyncio
+import os
+from time import perf_counter
+from timeit import timeit
+from nacl.signing import SigningKey, VerifyKey
+from EpikInteractions.interface import Interface
+
+signing_key = SigningKey.generate()
+public_key = signing_key.verify_key.encode().hex()
+
+body = b'{"type":2,"id":"937364424208039957","token":"' + b"a" * 160 + b'","data":{"name":"epikinteraction"}}'
+timestamp = "1650000000"
+signature = signing_key.sign(timestamp.encode() + body).signature.hex()
+
+cached_key = VerifyKey(bytes.fromhex(public_key))
+
+
+def before():
+    interaction_data = body.decode("utf-8")
+    verify_key = VerifyKey(bytes.fromhex(public_key))
+    verify_key.verify(f"{timestamp}{interaction_data}".encode(), bytes.fromhex(signature))
+
+
+def after():
+    cached_key.verify(timestamp.encode() + body, bytes.fromhex(signature))
+
+
+async def ticker(lateness: list, stop: asyncio.Event, interval: float = 0.001):
+    while not stop.is_set():
+        start = perf_counter()
+        await asyncio.sleep(interval)
+        lateness.append(perf_counter() - start - interval)
+
+
+async def loop_latency(verify_in_thread: bool, concurrency: int = 50, bursts: int = 40):
+    client = Interface(public_key = public_key, verify_in_thread = verify_in_thread, verify_workers = 4)
+    lateness, stop = [], asyncio.Event()
+    task = asyncio.create_task(ticker(lateness, stop))
+    await asyncio.sleep(0.01)
+
+    start = perf_counter()
+    for _ in range(bursts):
+        await asyncio.gather(*(client.verify_request(body, signature, timestamp) for _ in range(concurrency)))
+        await asyncio.sleep(0)
+    elapsed = perf_counter() - start
+
+    stop.set()
+    await task
+    await client.shutdown()
+    lateness.sort()
+    return concurrency * bursts / elapsed, lateness[len(lateness) // 2], lateness[int(len(lateness) * 0.99)], lateness[-1]
+
+
+async def main():
+    number = 20000
+    for name, func in (("before", before), ("after", after)):
+        seconds = timeit(func, number = number)
+        print(f"{name:>6}: {seconds / number * 1e6:.2f}us per request")
+
+    print(f"\nEvent loop lateness while verifying bursts of 50 concurrent requests, on {os.cpu_count()} CPU cores:")
+    for name, in_thread in (("on loop", False), ("in thread", True)):
+        throughput, median, p99, worst = await loop_latency(in_thread)
+        print(f"{name:>9}: {throughput:,.0f} requests/s, lateness median {median * 1e3:.2f}ms, p99 {p99 * 1e3:.2f}ms, max {worst * 1e3:.2f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,7 +1,7 @@
 from EpikInteractions import Interface
-from quart import Quart, request, jsonify
+from quart import Quart
 
-client = Interface("2e1e645ac21e02cbeba163e7fa5f41ebc0461c15fa26deb6f4775ea6197ac881")
+client = Interface(public_key = "2e1e645ac21e02cbeba163e7fa5f41ebc0461c15fa26deb6f4775ea6197ac881")
 
 @client.command(
     name = "epikinteraction",
@@ -15,4 +15,11 @@ app = Quart(__name__)
 
 @app.post("/")
 async def interactions():
-    client.process_commands()
\ No newline at end of file
+    return await client.process_commands()
+@app.before_serving
+async def startup():
+    await client.startup()
+
+@app.after_serving
+async def shutdown():
+    await client.shutdown()